@@ -0,0 +1,109 @@
+"""Implausible Total Hours readings.
+
+Running hours come from the Total Hours increase between a machine's
+consecutive readings, so one mistyped reading turns into a negative or
+impossible month in the KPIs. A reading is flagged when it is lower than
+the machine's previous reading, or higher by more hours than the calendar
+allows between the two dates (plus SLACK_HOURS, since readings carry a date
+and no time).
+
+scan() checks a whole table in one vectorized pass. check() tests a single
+new reading against the machine's last reading (kpi_store keeps those
+current incrementally), so validating a form entry costs one lookup.
+scan_from() does what check() does for a batch of new readings at once.
+"""
+import numpy as np
+import pandas as pd
+
+SLACK_HOURS = 24.0
+
+
+def _report(readings, other_date, other_hours, gain, calendar, key, lower="lower than before"):
+    """The flagged rows of readings, each with the reading it was compared to."""
+    low = (gain < 0).to_numpy()
+    flagged = low | (gain > calendar + SLACK_HOURS).to_numpy()
+    problem = np.where(low[flagged], lower, "more than the calendar allows")
+    rows = readings[flagged]
+    return pd.DataFrame({
+        key: rows[key].astype(str),
+        "Date": rows["Date"],
+        "Total Hours": rows["Total Hours"],
+        "Previous Date": other_date[flagged],
+        "Previous Hours": other_hours[flagged],
+        "Gain (h)": gain[flagged],
+        "Calendar (h)": calendar[flagged],
+        "Problem": pd.Series(problem, index=rows.index, dtype="object"),
+    })
+
+
+def _readings(df, key):
+    return df.loc[df["Total Hours"].notna() & df[key].notna() & df["Date"].notna(), [key, "Date", "Total Hours"]]
+
+
+def _chained(readings, key, before=None):
+    """scan()'s report for readings sorted by machine and date, each against the
+    one before it; before (aligned with readings) supplies each machine's first."""
+    g = readings.groupby(key, observed=True, sort=False)
+    prev_date = g["Date"].shift()
+    prev_hours = g["Total Hours"].shift().astype("float64")
+    if before is not None:
+        prev_date = prev_date.fillna(before["Date"])
+        prev_hours = prev_hours.fillna(before["Total Hours"].astype("float64"))
+    gain = readings["Total Hours"].astype("float64") - prev_hours
+    calendar = (readings["Date"] - prev_date).dt.total_seconds() / 3600
+    return _report(readings, prev_date, prev_hours, gain, calendar, key)
+
+
+def scan(df, key="Compressor"):
+    """Every reading in df that is lower than the previous one of its machine or
+    gained more than calendar hours since it; one row per flagged reading."""
+    readings = _readings(df, key).sort_values([key, "Date"], kind="stable")
+    return _chained(readings, key).reset_index(drop=True)
+
+
+def scan_from(last, df, key="Compressor"):
+    """scan() of the readings in df as the continuation of a table whose last
+    reading per machine is last (indexed by machine, as check() takes it).
+
+    Readings dated on or after their machine's last one are chained from it;
+    earlier ones are checked against that later reading, as check() does.
+    Only df's readings are reported, so a caller checking batch after batch
+    keeps one row per machine, not the readings seen so far.
+    """
+    readings = _readings(df, key)
+    seed = last.reindex(readings[key].to_numpy()).set_axis(readings.index)
+    back = (readings["Date"] < seed["Date"]).to_numpy()
+    flagged = _chained(readings[~back].sort_values([key, "Date"], kind="stable"), key, before=seed)
+    if back.any():
+        earlier, later = readings[back], seed[back]
+        later_hours = later["Total Hours"].astype("float64")
+        gain = later_hours - earlier["Total Hours"].astype("float64")
+        calendar = (later["Date"] - earlier["Date"]).dt.total_seconds() / 3600
+        backdated = _report(earlier, later["Date"], later_hours, gain, calendar, key, lower="above a later reading")
+        flagged = pd.concat([flagged, backdated]).sort_values([key, "Date"], kind="stable")
+    return flagged.reset_index(drop=True)
+
+
+def check(last, machine, date, total_hours):
+    """Why the reading (machine, date, total_hours) is implausible, or None.
+
+    last is indexed by machine name with "Date" and "Total Hours" columns,
+    as kpi_store.last_readings() returns it. A reading dated before the
+    machine's last one is checked against that later reading instead.
+    """
+    if machine not in last.index:
+        return None  # first reading of this machine
+    last_date, last_hours = last.at[machine, "Date"], float(last.at[machine, "Total Hours"])
+    date = pd.Timestamp(date)
+    calendar = abs((date - last_date).total_seconds()) / 3600
+    gain = float(total_hours) - last_hours
+    if date < last_date:
+        gain = -gain
+        if gain < 0:
+            return f"{total_hours:,.1f} h is above the later reading of {last_hours:,.1f} h on {last_date:%Y-%m-%d}"
+    elif gain < 0:
+        return f"{total_hours:,.1f} h is below the last reading of {last_hours:,.1f} h on {last_date:%Y-%m-%d}"
+    if gain > calendar + SLACK_HOURS:
+        return (f"{gain:,.1f} h between {min(date, last_date):%Y-%m-%d} and {max(date, last_date):%Y-%m-%d} "
+                f"is more than the {calendar:,.0f} calendar hours")
+    return None
@@ -0,0 +1,115 @@
+"""RSS growth per KPIs-tab rerun: pyplot figures (never closed) vs charts.
+
+    python -m benchmarks.bench_charts [reruns]
+
+Each rerun draws the tab's three charts for the same selection, as a
+Streamlit rerun does when the user changes an unrelated widget. The cached
+case only measures cache hits; the uncached case clears the chart cache
+before every rerun, so all three figures are built, rendered and released
+each time. tests/test_charts.py checks the uncached growth against
+FLAT_KB_PER_RERUN.
+"""
+import gc
+import io
+import os
+import sys
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+import charts  # noqa: E402
+
+# Uncached renders may grow RSS by at most this much per rerun (allocator noise; the
+# pyplot figures this replaced leak about 7.6 MB per rerun).
+FLAT_KB_PER_RERUN = 256
+
+
+def rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def synthetic_cube(n_machines=13, n_months=24, seed=0):
+    rng = np.random.default_rng(seed)
+    months = [str(p) for p in pd.period_range("2024-01", periods=n_months, freq="M")]
+    return pd.DataFrame({
+        "Compressor": np.repeat([f"Compressor {i}" for i in range(n_machines)], n_months),
+        "Month": months * n_machines,
+        "Running Hours": rng.uniform(0, 720, n_machines * n_months),
+        "Total Hours": rng.uniform(1e4, 9e4, n_machines * n_months),
+        "Availability": rng.uniform(80, 100, n_machines * n_months),
+    })
+
+
+def legacy_rerun(cube, machine, month):
+    """The KPIs tab before charts.py: three pyplot figures, never closed."""
+    group = cube[cube["Compressor"] == machine]
+    fig, ax = plt.subplots(figsize=(7, 3))
+    ax.plot(group["Month"], group["Availability"], marker="o", linewidth=2, color="#ffde59")
+    for i, v in enumerate(group["Availability"]):
+        ax.text(i, v, f"{v:.1f}", ha="center", va="bottom", fontsize=11, color="#fff")
+    plt.tight_layout()
+    fig.savefig(io.BytesIO(), format="png")
+
+    month_rows = cube[cube["Month"] == month]
+    fig2, ax2 = plt.subplots(figsize=(10, 4))
+    ax2.bar(month_rows["Compressor"], month_rows["Running Hours"], width=0.6)
+    plt.tight_layout()
+    fig2.savefig(io.BytesIO(), format="png")
+
+    plt.style.use("dark_background")
+    fig3, ax3 = plt.subplots(figsize=(11, 5))
+    ax3.bar(month_rows["Compressor"], month_rows["Total Hours"], width=0.65)
+    plt.tight_layout()
+    fig3.savefig(io.BytesIO(), format="png")
+
+
+def charts_rerun(cube, machine, month):
+    group = cube[cube["Compressor"] == machine]
+    charts.trend_png(group["Month"], group["Availability"], "Availability", machine)
+    month_rows = cube[cube["Month"] == month]
+    charts.running_hours_png(month_rows["Compressor"], month_rows["Running Hours"], "Compressor", month)
+    charts.total_hours_png(month_rows["Compressor"], month_rows["Total Hours"], "Compressor", month)
+
+
+def uncached_rerun(cube, machine, month):
+    charts.clear()
+    charts_rerun(cube, machine, month)
+
+
+def measure(rerun, cube, reruns):
+    rerun(cube, "Compressor 0", "2024-06")  # warm-up: imports, font cache
+    gc.collect()
+    before = rss_mb()
+    start = time.perf_counter()
+    for _ in range(reruns):
+        rerun(cube, "Compressor 0", "2024-06")
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    return (rss_mb() - before) / reruns, elapsed / reruns
+
+
+def run(reruns=50):
+    cube = synthetic_cube()
+    growth, per = measure(charts_rerun, cube, reruns)
+    print(f"{reruns} reruns of the KPIs tab")
+    print(f"  charts (cached)   {growth * 1024:8.1f} KB RSS/rerun  {per * 1000:7.1f} ms/rerun")
+    measure(uncached_rerun, cube, reruns)  # first pass: fill allocator pools and font caches
+    growth, per = measure(uncached_rerun, cube, reruns)
+    print(f"  charts (uncached) {growth * 1024:8.1f} KB RSS/rerun  {per * 1000:7.1f} ms/rerun")
+    growth, per = measure(legacy_rerun, cube, reruns)
+    print(f"  pyplot (legacy)   {growth * 1024:8.1f} KB RSS/rerun  {per * 1000:7.1f} ms/rerun  "
+          f"({len(plt.get_fignums())} open figures)")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
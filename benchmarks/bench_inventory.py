@@ -0,0 +1,54 @@
+"""Inventory engine on a large transactions ledger.
+
+    python -m benchmarks.bench_inventory [n_transactions]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import inventory
+from benchmarks import synthetic
+
+
+def synthetic_ledger(n, n_parts=2000, seed=0):
+    critical = synthetic.critical_parts(n_parts, seed)
+    return critical, synthetic.transactions(n, critical["Part Number"], seed=seed)
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def run(n=1_000_000):
+    critical, transactions = synthetic_ledger(n)
+    ledger = inventory.Ledger()
+    _, t_full = _timed(lambda: ledger.update(transactions))
+    stock, t_table = _timed(lambda: inventory.stock_table(critical, ledger.net))
+
+    opening = inventory._opening(critical)
+    _, t_balances = _timed(lambda: ledger.balances(transactions, opening))
+    _, t_rerun = _timed(lambda: ledger.balances(transactions, opening))
+
+    # New rows dated after the ledger, as form saves are.
+    extra = synthetic_ledger(10, seed=1)[1]
+    extra["Date"] = transactions["Date"].max() + pd.to_timedelta(np.arange(1, 11), unit="D")
+    grown = pd.concat([transactions, extra], ignore_index=True)
+    _, t_incr = _timed(lambda: ledger.update(grown))
+    _, t_recompute = _timed(lambda: inventory.net_movements(grown))
+    _, t_incr_balances = _timed(lambda: ledger.balances(grown, opening))
+    _, t_running = _timed(lambda: inventory.running_balances(critical, grown))
+
+    print(f"{n} transactions, {len(stock)} parts, {int(stock['Below Minimum'].sum())} below minimum")
+    print(f"  full net movement      {t_full * 1000:8.1f} ms")
+    print(f"  stock table            {t_table * 1000:8.1f} ms")
+    print(f"  +10 rows incremental   {t_incr * 1000:8.1f} ms (full recompute {t_recompute * 1000:.1f} ms)")
+    print(f"  running balances       {t_balances * 1000:8.1f} ms first, {t_rerun * 1000:.1f} ms rerun, "
+          f"{t_incr_balances * 1000:.1f} ms after +10 rows (full recompute {t_running * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
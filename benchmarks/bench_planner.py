@@ -0,0 +1,69 @@
+"""Vectorized planner vs the old per-compressor loop.
+
+    python -m benchmarks.bench_planner [n_compressors ...]
+"""
+import sys
+import time
+
+import pandas as pd
+
+import planner
+from benchmarks import synthetic
+
+
+def synthetic_hours(n_compressors, years=10, seed=0):
+    df = synthetic.compressor_hours(n_compressors, years, seed=seed)
+    return df, synthetic.compressor_names(n_compressors)
+
+
+def legacy_remaining(maint_df, machines):
+    """The loop m.py used before the planner module (kept verbatim for comparison)."""
+    maint_types = [5000, 10000, 40000]
+    current_hours = maint_df.groupby("Compressor")["Total Hours"].max().reset_index()
+    result = []
+    warnings = {5000: False, 10000: False, 40000: False}
+    for compressor in machines:
+        comp_maint = maint_df[maint_df["Compressor"] == compressor]
+        ch_row = current_hours[current_hours["Compressor"] == compressor]
+        if ch_row.empty:
+            continue
+        ch = ch_row["Total Hours"].values[0]
+        row = {"Compressor": compressor, "Current Total Hours": ch}
+        for mt in maint_types:
+            last_maint = comp_maint[comp_maint["Maintenance Type"] == f"{mt}h"]
+            if not last_maint.empty:
+                last_h = last_maint.sort_values("Date")["Hours at Maintenance"].iloc[-1]
+                next_due = last_h + mt
+                remaining = next_due - ch
+                months = remaining / 360
+                row[f"Next {mt}h At"] = next_due
+                row[f"Remaining to {mt}h"] = f"{remaining:.0f} ({months:.1f} mo)"
+                if 0 < months < 6:
+                    warnings[mt] = True
+            else:
+                row[f"Next {mt}h At"] = "-"
+                row[f"Remaining to {mt}h"] = "-"
+        result.append(row)
+    return pd.DataFrame(result), warnings
+
+
+def _best_of(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes=(10, 500)):
+    for n in sizes:
+        df, names = synthetic_hours(n)
+        t_legacy = _best_of(lambda: legacy_remaining(df, names), repeat=3)
+        t_new = _best_of(lambda: planner.remaining_to_next_maintenance(df, machines=names))
+        print(f"{n:>5} compressors, {len(df):>7} rows: loop {t_legacy * 1000:9.1f} ms | "
+              f"vectorized {t_new * 1000:7.1f} ms | x{t_legacy / t_new:.0f}")
+
+
+if __name__ == "__main__":
+    run([int(a) for a in sys.argv[1:]] or (10, 500))
@@ -0,0 +1,62 @@
+"""PDF render time for maintenance-log sized tables.
+
+    python -m benchmarks.bench_report [rows ...]
+
+The old iterrows renderer is only timed up to LEGACY_MAX_ROWS rows.
+"""
+import os
+import sys
+import tempfile
+import time
+
+from fpdf import FPDF
+
+import log_index
+import report
+from benchmarks import synthetic
+
+LEGACY_MAX_ROWS = 10_000
+
+
+def synthetic_log(n, seed=0):
+    return synthetic.maintenance_log(seed=seed, n=n)[log_index.DISPLAY_COLUMNS]
+
+
+def legacy_export_df_to_pdf(df, title="Report"):
+    """The renderer m.py used before report.render_pdf (kept for comparison)."""
+    pdf = FPDF(orientation='L', unit='mm', format='A4')
+    pdf.add_page()
+    pdf.set_font("Arial", size=12)
+    pdf.cell(0, 10, txt=title, ln=1, align="C")
+    pdf.ln(5)
+    col_widths = [max(len(str(x)) for x in [col] + df[col].astype(str).tolist()) * 2.5 for col in df.columns]
+    row_height = 8
+    for i, col in enumerate(df.columns):
+        pdf.cell(col_widths[i], row_height, str(col), border=1, align="C")
+    pdf.ln(row_height)
+    for idx, row in df.iterrows():
+        for i, col in enumerate(df.columns):
+            pdf.cell(col_widths[i], row_height, str(row[col]), border=1, align="C")
+        pdf.ln(row_height)
+    tmpfile = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
+    pdf.output(tmpfile.name)
+    return tmpfile.name
+
+
+def run(sizes=(100, 10_000, 100_000)):
+    for n in sizes:
+        df = synthetic_log(n)
+        start = time.perf_counter()
+        data = report.render_pdf(df, "Maintenance Log")
+        t_new = time.perf_counter() - start
+        line = f"{n:>7} rows: render_pdf {t_new:7.2f} s ({len(data) / 1e6:5.1f} MB)"
+        if n <= LEGACY_MAX_ROWS:
+            start = time.perf_counter()
+            os.remove(legacy_export_df_to_pdf(df, "Maintenance Log"))
+            t_old = time.perf_counter() - start
+            line += f" | iterrows {t_old:7.2f} s"
+        print(line)
+
+
+if __name__ == "__main__":
+    run([int(a) for a in sys.argv[1:]] or (100, 10_000, 100_000))
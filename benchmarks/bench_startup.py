@@ -0,0 +1,103 @@
+"""Cold-start and per-tab rerun latency of the dashboard.
+
+    python -m benchmarks.bench_startup [--reruns N] [--script m.py] [--exe dist/m]
+
+Cold start runs the script once in a fresh interpreter per tab (Streamlit's
+own import excluded) and lists which heavy modules that tab pulled in.
+Rerun latency is the median of N further runs of the same, already warm,
+session. Every run works in a fresh copy of the workbooks, as
+benchmarks.suite does, so sidecars, KPI state and the profile log are not
+written into the checkout.
+
+--exe times one run of the PyInstaller build from m.spec, from process
+start to exit. The build runs the script once in Streamlit's bare mode,
+which always shows the default tab (Maintenance Log), so it gives a single
+cold-start figure, not per-tab numbers.
+"""
+import argparse
+import glob
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TABS = ["Compressors", "Maintenance Log", "Spare Parts", "KPIs"]
+HEAVY_MODULES = ["matplotlib", "fpdf", "charts", "search_index", "forecast"]
+
+_CHILD = """
+import json, os, sys, time
+sys.path.insert(0, os.path.dirname(sys.argv[1]))
+from streamlit.testing.v1 import AppTest
+start = time.perf_counter()
+at = AppTest.from_file(sys.argv[1], default_timeout=300)
+at.session_state["active_tab"] = sys.argv[2]
+at.run()
+cold = time.perf_counter() - start
+if at.exception:
+    sys.exit(f"{sys.argv[2]} raised: {[e.value for e in at.exception]}")
+reruns = []
+for _ in range(int(sys.argv[3])):
+    t = time.perf_counter()
+    at.run()
+    reruns.append(time.perf_counter() - t)
+print(json.dumps({"cold": cold, "reruns": reruns,
+                  "loaded": [m for m in sys.argv[4].split(",") if m in sys.modules]}))
+"""
+
+
+def _run_in_copy(fn):
+    """fn(folder) in a fresh temp copy of the shipped workbooks."""
+    work = tempfile.mkdtemp(prefix="bench-startup-")
+    try:
+        for path in glob.glob(os.path.join(ROOT, "*.xlsx")):
+            shutil.copy(path, work)
+        return fn(work)
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+def time_tab(script, tab, reruns):
+    out = _run_in_copy(lambda work: subprocess.run(
+        [sys.executable, "-c", _CHILD, script, tab, str(reruns), ",".join(HEAVY_MODULES)],
+        cwd=work, capture_output=True, text=True, check=True))
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def time_exe(exe, timeout=300):
+    exe = os.path.abspath(exe)
+
+    def run(work):
+        start = time.perf_counter()
+        subprocess.run([exe], cwd=work, capture_output=True, timeout=timeout)
+        return time.perf_counter() - start
+    return _run_in_copy(run)
+
+
+def run(script="m.py", reruns=10, exe=None):
+    script = os.path.join(ROOT, script)
+    print(f"{os.path.relpath(script, ROOT)}: cold start and rerun latency ({reruns} reruns)")
+    for tab in TABS:
+        r = time_tab(script, tab, reruns)
+        median = statistics.median(r["reruns"]) if r["reruns"] else float("nan")
+        print(f"  {tab:<16} cold {r['cold'] * 1000:8.0f} ms | rerun {median * 1000:7.1f} ms | "
+              f"loaded: {', '.join(r['loaded']) or '-'}")
+    if exe:
+        if os.path.exists(exe):
+            print(f"  {os.path.basename(exe)} (PyInstaller, default tab) start to exit "
+                  f"{time_exe(exe) * 1000:8.0f} ms")
+        else:
+            print(f"  {exe} not found; build it with: pyinstaller m.spec")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--script", default="m.py")
+    parser.add_argument("--reruns", type=int, default=10)
+    parser.add_argument("--exe", default=None)
+    args = parser.parse_args()
+    run(args.script, args.reruns, args.exe)
@@ -0,0 +1,180 @@
+"""Headless timings of the dashboard's stages on synthetic plant data.
+
+    python -m benchmarks.suite [scale options] [--repeat 3] [--out results.json]
+    python -m benchmarks.suite --compare old.json new.json
+
+Workbooks are generated once (see benchmarks.synthetic for the scale
+options), then every repeat copies them into a fresh folder, so each run
+starts with cold module caches and no Parquet sidecars, and times the
+stages the tabs run: load, filter, remaining hours, KPI aggregation, PDF
+export and save. The JSON file records the commit, versions, scale, row
+counts and per-stage timings; --compare prints the ratio per stage.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+import data_store
+import equipment
+import forecast
+import inventory
+import log_index
+import planner
+import report
+from benchmarks import synthetic
+
+SLOWER = 1.2
+
+
+class _Timer:
+    def __init__(self):
+        self.stages = {}
+
+    def stage(self, name, fn, rows=None):
+        """Time fn(); rows defaults to len() of its result."""
+        start = time.perf_counter()
+        result = fn()
+        seconds = time.perf_counter() - start
+        if rows is None and hasattr(result, "__len__"):
+            rows = len(result)
+        self.stages[name] = {"seconds": seconds, "rows": rows}
+        return result
+
+
+def run_once(source, machine):
+    """Time every stage against a fresh copy of the workbooks in source."""
+    work = tempfile.mkdtemp(prefix="bench-run-")
+    cwd = os.getcwd()
+    try:
+        for name in os.listdir(source):
+            shutil.copy(os.path.join(source, name), work)
+        os.chdir(work)
+        t = _Timer()
+        files = [data_store.COMPRESSOR_HOURS_FILE, data_store.MAINTENANCE_LOG_FILE,
+                 data_store.CRITICAL_SPARE_PARTS_FILE, data_store.SPARE_PARTS_TRANSACTIONS_FILE]
+        t.stage("load_cold", lambda: pd.concat([data_store.read_table(f) for f in files], ignore_index=True))
+        data_store.invalidate()
+        t.stage("load_warm", lambda: pd.concat([data_store.read_table(f) for f in files], ignore_index=True))
+
+        index = t.stage("filter_index", lambda: data_store.derived(
+            data_store.MAINTENANCE_LOG_FILE, "log_index", log_index.LogIndex))
+        first, last = index.date_bounds()
+        filtered = t.stage("filter_query", lambda: index.query(machine, first, last))
+
+        def remaining():
+            hours = equipment.table(["Compressor"])
+            rates = forecast.hours_per_month(hours, key=equipment.KEY)
+            result = planner.remaining_to_next_maintenance(hours, hours_per_month=rates, key=equipment.KEY)
+            schedule = forecast.due_schedule(hours, rates=rates, key=equipment.KEY)
+            parts = data_store.read_table(data_store.MAINTENANCE_PARTS_FILE)
+            forecast.order_plan(schedule, parts, inventory.current_stock(), key=equipment.KEY)
+            return result
+        t.stage("remaining_hours", remaining)
+
+        t.stage("kpi_full", equipment.kpi_cube)
+        t.stage("pdf_export", lambda: report.render_pdf(filtered, "Maintenance Log"), rows=len(filtered))
+
+        today = datetime.date.today()
+        events = [{"Date": today, "Machine": machine, "Time (min)": 30, "Event": "Replace oil filter",
+                   "Spare Parts": "oil filter"} for _ in range(10)]
+        readings = [equipment.reading_row("Compressor", today, name, 1e6)
+                    for name in equipment.EQUIPMENT_CLASSES["Compressor"]["machines"]]
+
+        def save():
+            data_store.append_rows(data_store.MAINTENANCE_LOG_FILE, events)
+            data_store.append_rows(data_store.COMPRESSOR_HOURS_FILE, readings)
+            return data_store.read_table(data_store.MAINTENANCE_LOG_FILE)
+        t.stage("save", save)
+        t.stage("kpi_incremental", equipment.kpi_cube)
+        return t.stages
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(work, ignore_errors=True)
+
+
+def _commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run(scale, repeat=3, out=None):
+    source = tempfile.mkdtemp(prefix="bench-data-")
+    try:
+        start = time.perf_counter()
+        rows = synthetic.write_workbooks(source, **scale)
+        generate_s = time.perf_counter() - start
+        machine = synthetic.compressor_names(scale["machines"])[0]
+        runs = [run_once(source, machine) for _ in range(repeat)]
+    finally:
+        shutil.rmtree(source, ignore_errors=True)
+
+    stages = {}
+    for name in runs[0]:
+        seconds = [r[name]["seconds"] for r in runs]
+        stages[name] = {"median_s": statistics.median(seconds), "runs_s": seconds, "rows": runs[0][name]["rows"]}
+    results = {
+        "meta": {"commit": _commit(), "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+                 "python": platform.python_version(), "pandas": pd.__version__,
+                 "pyarrow": data_store.HAS_PYARROW, "platform": platform.platform()},
+        "scale": scale,
+        "workbook_rows": rows,
+        "generate_s": generate_s,
+        "stages": stages,
+    }
+    print(f"scale {scale} | generated in {generate_s:.1f} s | median of {repeat}")
+    for name, s in stages.items():
+        rows_text = "" if s["rows"] is None else f"{s['rows']:>9} rows"
+        print(f"  {name:<16} {s['median_s'] * 1000:9.1f} ms  {rows_text}")
+    if out:
+        with open(out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"wrote {out}")
+    return results
+
+
+def compare(old_path, new_path):
+    with open(old_path, encoding="utf-8") as f:
+        old = json.load(f)
+    with open(new_path, encoding="utf-8") as f:
+        new = json.load(f)
+    if old["scale"] != new["scale"]:
+        print(f"warning: scales differ ({old['scale']} vs {new['scale']})")
+    print(f"{old['meta']['commit'] or old_path} -> {new['meta']['commit'] or new_path}")
+    slower = []
+    for name in new["stages"]:
+        if name not in old["stages"]:
+            print(f"  {name:<16} {'-':>9}    -> {new['stages'][name]['median_s'] * 1000:9.1f} ms  (new)")
+            continue
+        a, b = old["stages"][name]["median_s"], new["stages"][name]["median_s"]
+        ratio = b / a if a else float("inf")
+        flag = "  slower" if ratio > SLOWER else ""
+        if flag:
+            slower.append(name)
+        print(f"  {name:<16} {a * 1000:9.1f} ms -> {b * 1000:9.1f} ms  x{ratio:.2f}{flag}")
+    return slower
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    synthetic.add_scale_arguments(parser)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", default=None)
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"))
+    args = parser.parse_args()
+    if args.compare:
+        sys.exit(1 if compare(*args.compare) else 0)
+    run(synthetic.scale_from_args(args), args.repeat, args.out)
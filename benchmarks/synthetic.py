@@ -0,0 +1,172 @@
+"""Synthetic plant data with the same columns as the shipped workbooks.
+
+    python -m benchmarks.synthetic OUT_DIR [--years 10] [--machines 13]
+                                   [--events-per-day 5] [--parts 500]
+                                   [--transactions-per-day 10] [--seed 0]
+
+Every generator is deterministic for a given seed. write_workbooks() writes
+the full set of workbooks under the file names data_store expects, so the
+dashboard or benchmarks.suite can run against OUT_DIR as their working
+directory.
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+import data_store
+import equipment
+import planner
+
+START = pd.Timestamp("2015-01-01")
+
+HOURS_COLUMNS = ["Month", "Compressor", "Running Hours", "Total Hours", "Notes",
+                 "Maint 5000h", "Maint 10000h", "Maint 40000h", "Date", "Maintenance Type",
+                 "Hours at Maintenance", "DOWN TIME (HRS)", "NO. OF FAULTS", "MTTR", "MTBF", "AVAILABILITY"]
+COOLING_TOWER_COLUMNS = ["Month", "Cooling Tower", "Running Hours", "Total Hours", "Notes"]
+LOG_COLUMNS = ["Date", "Machine", "Event", "Time", "Technician", "Time (min)", "Spare Parts", "Description"]
+CRITICAL_COLUMNS = ["Part Number", "Part Name", "Quantity", "Unit", "Minimum Stock", "Location", "Machine", "Notes"]
+TRANSACTION_COLUMNS = ["Date", "Transaction Type", "Part Number", "Part Name", "Quantity", "Machine", "Note"]
+PARTS_LIST_COLUMNS = ["Interval", "Part Number", "Part Name", "Quantity", "Compressor"]
+
+EVENTS = np.array([
+    "Replace oil filter", "Clean suction strainer", "Replace mechanical seal",
+    "Replace motor bearing D.E (6316)", "Replace fine filter and 2 oil filter",
+    "Check oil pump pressure", "Adjust capacity slide valve", "Clean cooling tower basin",
+])
+SPARES = np.array(["oil filter", "mechanical seal", "bearing 6316", "fine filter", "gasket"])
+
+
+def compressor_names(n):
+    """The plant's compressor names, extended with numbered ones past 13."""
+    names = equipment.MACHINE_LIST[:13]
+    return names[:n] if n <= len(names) else names + [f"Compressor ({i})" for i in range(len(names) + 1, n + 1)]
+
+
+def compressor_hours(n_compressors=13, years=10, readings_per_month=1, maintenance_per_interval=3, seed=0):
+    """Total Hours readings, downtime/fault entries and maintenance rows."""
+    rng = np.random.default_rng(seed)
+    names = compressor_names(n_compressors)
+    dates = START + pd.to_timedelta(np.arange(12 * years * readings_per_month) * (30.4375 / readings_per_month), unit="D")
+    dates = dates.normalize()
+    start = rng.uniform(0, 50000, n_compressors)
+    rate = rng.uniform(200, 700, n_compressors) / readings_per_month
+    step = np.arange(len(dates))
+    n = n_compressors * len(dates)
+    downtime = np.where(rng.random(n) < 0.1, rng.uniform(1, 48, n).round(1), np.nan)
+    readings = pd.DataFrame({
+        "Date": np.tile(dates, n_compressors),
+        "Compressor": np.repeat(names, len(dates)),
+        "Total Hours": (start[:, None] + rate[:, None] * step).ravel().round(0),
+        "DOWN TIME (HRS)": downtime,
+        "NO. OF FAULTS": np.where(np.isnan(downtime), np.nan, rng.integers(1, 4, n)),
+    })
+    maint_rows = []
+    for mt in planner.DEFAULT_INTERVALS:
+        for _ in range(maintenance_per_interval):
+            picked = readings.iloc[rng.integers(0, len(readings), n_compressors)]
+            maint_rows.append(pd.DataFrame({
+                "Date": picked["Date"].to_numpy(),
+                "Compressor": picked["Compressor"].to_numpy(),
+                "Maintenance Type": f"{mt}h",
+                "Hours at Maintenance": picked["Total Hours"].to_numpy(),
+            }))
+    return pd.concat([readings, *maint_rows], ignore_index=True).reindex(columns=HOURS_COLUMNS)
+
+
+def maintenance_log(years=10, events_per_day=5, machines=None, seed=0, n=None):
+    """Log events over years; n, if given, overrides the events_per_day count."""
+    rng = np.random.default_rng(seed)
+    machines = np.array(machines or equipment.MACHINE_LIST)
+    if n is None:
+        n = int(years * 365 * events_per_day)
+    return pd.DataFrame({
+        "Date": START + pd.to_timedelta(rng.integers(0, years * 365, n), unit="D"),
+        "Machine": machines[rng.integers(0, len(machines), n)],
+        "Event": EVENTS[rng.integers(0, len(EVENTS), n)],
+        "Time (min)": rng.integers(0, 480, n).astype(float),
+        "Spare Parts": np.where(rng.random(n) < 0.3, SPARES[rng.integers(0, len(SPARES), n)], None),
+    }).reindex(columns=LOG_COLUMNS)
+
+
+def critical_parts(n_parts=500, seed=0):
+    rng = np.random.default_rng(seed)
+    part_numbers = np.arange(100000, 100000 + n_parts)
+    return pd.DataFrame({
+        "Part Number": part_numbers,
+        "Part Name": [f"Part {p}" for p in part_numbers],
+        "Quantity": rng.integers(0, 20, n_parts),
+        "Unit": "pcs",
+        "Minimum Stock": rng.integers(1, 10, n_parts),
+    }).reindex(columns=CRITICAL_COLUMNS)
+
+
+def transactions(n, part_numbers, days=3650, seed=0):
+    rng = np.random.default_rng(seed)
+    part_numbers = np.asarray(part_numbers)
+    return pd.DataFrame({
+        "Date": START + pd.to_timedelta(rng.integers(0, days, n), unit="D"),
+        "Transaction Type": np.where(rng.random(n) < 0.5, "In", "Out"),
+        "Part Number": part_numbers[rng.integers(0, len(part_numbers), n)],
+        "Quantity": rng.integers(1, 5, n).astype(float),
+    }).reindex(columns=TRANSACTION_COLUMNS)
+
+
+def parts_lists(part_numbers, per_interval=5, seed=0):
+    rng = np.random.default_rng(seed)
+    picked = rng.choice(np.asarray(part_numbers), (len(planner.DEFAULT_INTERVALS), per_interval), replace=False)
+    return pd.DataFrame({
+        "Interval": np.repeat([f"{mt}h" for mt in planner.DEFAULT_INTERVALS], per_interval),
+        "Part Number": picked.ravel(),
+        "Part Name": [f"Part {p}" for p in picked.ravel()],
+        "Quantity": rng.integers(1, 4, picked.size),
+    }).reindex(columns=PARTS_LIST_COLUMNS)
+
+
+def generate(years=10, machines=13, events_per_day=5, parts=500, transactions_per_day=10, seed=0):
+    """{workbook file name: frame} for one plant at the given scale."""
+    critical = critical_parts(parts, seed)
+    return {
+        data_store.COMPRESSOR_HOURS_FILE: compressor_hours(machines, years, seed=seed),
+        data_store.COOLING_TOWER_HOURS_FILE: pd.DataFrame(columns=COOLING_TOWER_COLUMNS),
+        data_store.MAINTENANCE_LOG_FILE: maintenance_log(
+            years, events_per_day, compressor_names(machines) + equipment.MACHINE_LIST[13:], seed),
+        data_store.CRITICAL_SPARE_PARTS_FILE: critical,
+        data_store.SPARE_PARTS_TRANSACTIONS_FILE: transactions(
+            int(years * 365 * transactions_per_day), critical["Part Number"], years * 365, seed),
+        data_store.MAINTENANCE_PARTS_FILE: parts_lists(critical["Part Number"], seed=seed),
+    }
+
+
+def write_workbooks(folder, **scale):
+    """Write generate(**scale) as xlsx workbooks into folder; returns {file name: rows}."""
+    os.makedirs(folder, exist_ok=True)
+    rows = {}
+    for name, df in generate(**scale).items():
+        df.to_excel(os.path.join(folder, name), index=False, sheet_name="Sheet1")
+        rows[name] = len(df)
+    return rows
+
+
+def add_scale_arguments(parser):
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--machines", type=int, default=13)
+    parser.add_argument("--events-per-day", type=float, default=5)
+    parser.add_argument("--parts", type=int, default=500)
+    parser.add_argument("--transactions-per-day", type=float, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def scale_from_args(args):
+    return {"years": args.years, "machines": args.machines, "events_per_day": args.events_per_day,
+            "parts": args.parts, "transactions_per_day": args.transactions_per_day, "seed": args.seed}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("out_dir")
+    add_scale_arguments(parser)
+    args = parser.parse_args()
+    for name, n in write_workbooks(args.out_dir, **scale_from_args(args)).items():
+        print(f"{n:>9} rows  {os.path.join(args.out_dir, name)}")
@@ -0,0 +1,271 @@
+"""Streaming bulk import of CMMS exports into the plant workbooks.
+
+    python bulk_import.py log FILE [--chunk-rows 5000] [--sheet NAME] [--dry-run] [--no-compact]
+    python bulk_import.py compressor_hours FILE ...
+    python bulk_import.py cooling_tower_hours FILE ...
+
+CSV files are read with pandas' chunked reader and xlsx files row by row
+with openpyxl's read-only mode, one chunk at a time. Each chunk is
+validated (a known machine name, a parseable date), deduplicated against
+the rows already in the table and earlier chunks (by a 64-bit hash of the
+key columns), and committed as one journal append. A source "Date" or
+"Month" column is mapped to the target's own date column. Each chunk's
+Total Hours readings are checked with anomalies.scan_from against the last
+reading per machine so far, and the flagged readings are reported (a dry
+run shows them before anything is written). Across chunks the import keeps
+a sorted array of 8-byte row hashes (existing and imported rows) and one
+reading per machine, besides the target table data_store already caches.
+The journal is folded into the workbook once, at the end (--no-compact
+leaves that to the app's background compaction). rows/sec covers the
+streaming phase; the final workbook rewrite is reported separately.
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+import anomalies
+import data_store
+import equipment
+import schema
+
+DEFAULT_CHUNK_ROWS = 5000
+MAX_REJECT_SAMPLES = 20
+
+# file: target workbook, machine_column: validated against the machine list,
+# date_column: the workbook's date column, key_columns: a row whose values
+# all match an existing row is a duplicate, readings: Total Hours readings
+# to check with anomalies.scan_from.
+TARGETS = {
+    "log": {
+        "file": data_store.MAINTENANCE_LOG_FILE,
+        "machine_column": "Machine",
+        "date_column": "Date",
+        "machines": equipment.MACHINE_LIST,
+        "key_columns": ["Date", "Machine", "Event", "Time (min)"],
+        "readings": False,
+    },
+}
+for _class, _spec in equipment.EQUIPMENT_CLASSES.items():
+    TARGETS[_class.lower().replace(" ", "_") + "_hours"] = {
+        "file": _spec["file"],
+        "machine_column": _spec["column"],
+        "date_column": _spec["date_column"],
+        "machines": _spec["machines"],
+        "key_columns": [_spec["date_column"], _spec["column"], "Total Hours",
+                        "Maintenance Type", "Hours at Maintenance"],
+        "readings": True,
+    }
+DATE_COLUMNS = ("Date", "Month")
+
+
+def iter_chunks(source, chunk_rows=DEFAULT_CHUNK_ROWS, name=None, sheet_name=None):
+    """Yield DataFrames of at most chunk_rows rows from a CSV or xlsx path or file object."""
+    name = name or getattr(source, "name", None) or str(source)
+    if name.lower().endswith((".xlsx", ".xlsm")):
+        yield from _xlsx_chunks(source, chunk_rows, sheet_name)
+    else:
+        yield from pd.read_csv(source, chunksize=chunk_rows)
+
+
+def _xlsx_chunks(source, chunk_rows, sheet_name):
+    import openpyxl
+
+    wb = openpyxl.load_workbook(source, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet_name] if sheet_name else wb.worksheets[0]
+        rows = ws.iter_rows(values_only=True)
+        header = [str(h).strip() if h is not None else f"Unnamed: {i}" for i, h in enumerate(next(rows, ()))]
+        batch = []
+        for row in rows:
+            if any(v is not None for v in row):
+                batch.append(row[:len(header)])
+            if len(batch) >= chunk_rows:
+                yield pd.DataFrame.from_records(batch, columns=header)
+                batch = []
+        if batch:
+            yield pd.DataFrame.from_records(batch, columns=header)
+    finally:
+        wb.close()
+
+
+def row_keys(df, columns):
+    """uint64 hash per row of the key columns, stable across dtypes (text, float, datetime)."""
+    parts = {}
+    for col in columns:
+        if col not in df.columns:
+            parts[col] = pd.Series("", index=df.index)
+            continue
+        s = df[col]
+        if col in ("Date", "Month"):
+            parts[col] = pd.to_datetime(s, errors="coerce").dt.strftime("%Y-%m-%d %H:%M:%S").fillna("")
+        elif schema.COLUMNS.get(col) in (schema.HOURS, schema.COUNT):
+            # At the stored (float32) precision, so a re-imported 1234.1 matches the saved one.
+            num = pd.to_numeric(s, errors="coerce").astype(schema.HOURS)
+            parts[col] = num.map(lambda v: "" if pd.isna(v) else repr(float(v)))
+        elif pd.api.types.is_numeric_dtype(s.dtype):
+            parts[col] = pd.to_numeric(s, errors="coerce").map(lambda v: "" if pd.isna(v) else repr(float(v)))
+        else:
+            parts[col] = s.astype("object").where(s.notna(), "").astype(str).str.strip()
+    return pd.util.hash_pandas_object(pd.DataFrame(parts), index=False).to_numpy()
+
+
+def validate(chunk, target):
+    """Split a chunk into (clean rows, rejected rows with a Reason column)."""
+    spec = TARGETS[target]
+    col = spec["machine_column"]
+    if col not in chunk.columns:
+        raise ValueError(f"Missing column {col!r}; found {list(chunk.columns)}")
+    chunk = chunk.copy()
+    # Exact names after trimming, or a case-insensitive match to the canonical spelling.
+    canonical = {m.lower(): m for m in spec["machines"]}
+    names = chunk[col].astype("object").where(chunk[col].notna(), "").astype(str).str.strip()
+    chunk[col] = names.str.lower().map(canonical)
+
+    date_col = spec["date_column"]
+    if date_col not in chunk.columns:
+        # Exports name it either way; the cooling tower sheet dates its readings by "Month".
+        source = next((c for c in DATE_COLUMNS if c in chunk.columns), None)
+        if source is None:
+            raise ValueError(f"Missing column {date_col!r}; found {list(chunk.columns)}")
+        chunk = chunk.rename(columns={source: date_col})
+    chunk[date_col] = pd.to_datetime(chunk[date_col], errors="coerce")
+
+    reason = pd.Series(None, index=chunk.index, dtype="object")
+    reason[chunk[date_col].isna()] = "bad date"
+    reason[chunk[col].isna()] = "unknown " + col.lower()
+    bad = reason.notna()
+    rejected = chunk[bad].assign(**{col: names[bad], "Reason": reason[bad]})
+    return chunk[~bad], rejected
+
+
+def _records(df):
+    return df.astype("object").where(df.notna(), None).to_dict("records")
+
+
+def _readings(df, spec):
+    """(machine, Date, Total Hours) of the readings in df, typed for anomalies."""
+    col = spec["machine_column"]
+    if "Total Hours" not in df.columns:
+        return pd.DataFrame(columns=[col, "Date", "Total Hours"])
+    out = pd.DataFrame({
+        col: df[col].astype("category"),
+        "Date": pd.to_datetime(df[spec["date_column"]], errors="coerce").astype("datetime64[ns]"),
+        "Total Hours": pd.to_numeric(df["Total Hours"], errors="coerce").astype(schema.HOURS),
+    })
+    return out.dropna()
+
+
+def last_readings(readings, spec):
+    """The latest of readings per machine, indexed by machine as anomalies.scan_from takes it."""
+    col = spec["machine_column"]
+    latest = readings.assign(**{col: readings[col].astype(str)}).sort_values([col, "Date"], kind="stable")
+    return latest.groupby(col).tail(1).set_index(col)[["Date", "Total Hours"]]
+
+
+def _is_in(sorted_keys, keys):
+    """Which of keys are in the sorted uint64 array sorted_keys."""
+    if not len(sorted_keys):
+        return np.zeros(len(keys), dtype=bool)
+    pos = np.searchsorted(sorted_keys, keys).clip(max=len(sorted_keys) - 1)
+    return sorted_keys[pos] == keys
+
+
+def import_file(target, source, chunk_rows=DEFAULT_CHUNK_ROWS, name=None, sheet_name=None,
+                dry_run=False, compact=True, on_batch=None):
+    """Stream source into the target's workbook. Returns a summary dict.
+
+    on_batch(summary) is called after every committed chunk (for progress).
+    """
+    spec = TARGETS[target]
+    path = spec["file"]
+    existing = data_store.read_table(path)
+    columns = list(existing.columns)
+    seen = np.unique(row_keys(existing, spec["key_columns"]))  # sorted
+    last = last_readings(_readings(existing, spec), spec) if spec["readings"] else None
+    del existing
+
+    summary = {"target": target, "file": path, "read": 0, "imported": 0, "duplicates": 0,
+               "rejected": 0, "batches": 0, "ignored_columns": [], "rejected_samples": [],
+               "flagged": 0, "flagged_samples": [],
+               "seconds": 0.0, "rows_per_sec": 0.0, "compact_seconds": 0.0}
+    start = time.perf_counter()
+    for chunk in iter_chunks(source, chunk_rows, name, sheet_name):
+        summary["read"] += len(chunk)
+        clean, rejected = validate(chunk, target)
+        extra = [c for c in clean.columns if c not in columns and c not in summary["ignored_columns"]]
+        summary["ignored_columns"] += extra
+        summary["rejected"] += len(rejected)
+        room = MAX_REJECT_SAMPLES - len(summary["rejected_samples"])
+        if room > 0 and not rejected.empty:
+            summary["rejected_samples"] += _records(rejected.head(room))
+
+        keys = row_keys(clean, spec["key_columns"])
+        # Drop rows already in the table and repeats inside this file.
+        _, first = np.unique(keys, return_index=True)
+        fresh = np.zeros(len(keys), dtype=bool)
+        fresh[first] = True
+        fresh &= ~_is_in(seen, keys)
+        summary["duplicates"] += int((~fresh).sum())
+        new = clean.loc[fresh, [c for c in clean.columns if c in columns]]
+        if not new.empty and not dry_run:
+            data_store.append_rows(path, _records(new), compact=False)
+        if last is not None and not new.empty:
+            readings = _readings(new, spec)
+            flagged = anomalies.scan_from(last, readings, key=spec["machine_column"])
+            room = MAX_REJECT_SAMPLES - len(summary["flagged_samples"])
+            if room > 0 and not flagged.empty:
+                summary["flagged_samples"] += _records(flagged.head(room))
+            summary["flagged"] += len(flagged)
+            last = pd.concat([last, last_readings(readings, spec)]).sort_values("Date", kind="stable")
+            last = last[~last.index.duplicated(keep="last")]
+        added = np.sort(keys[fresh])
+        seen = np.insert(seen, np.searchsorted(seen, added), added)
+        summary["imported"] += len(new)
+        summary["batches"] += 1
+        summary["seconds"] = time.perf_counter() - start
+        summary["rows_per_sec"] = summary["read"] / summary["seconds"] if summary["seconds"] else 0.0
+        if on_batch is not None:
+            on_batch(summary)
+
+    summary["seconds"] = time.perf_counter() - start
+    summary["rows_per_sec"] = summary["read"] / summary["seconds"] if summary["seconds"] else 0.0
+    if compact and summary["imported"] and not dry_run:
+        start = time.perf_counter()
+        data_store.compact(path)
+        summary["compact_seconds"] = time.perf_counter() - start
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("target", choices=sorted(TARGETS))
+    parser.add_argument("file")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument("--sheet", default=None)
+    parser.add_argument("--dry-run", action="store_true", help="validate and count without writing")
+    parser.add_argument("--no-compact", action="store_true", help="leave the rows in the journal")
+    args = parser.parse_args()
+
+    def progress(s):
+        print(f"  batch {s['batches']:>4}: {s['read']} read, {s['imported']} new, "
+              f"{s['duplicates']} duplicate, {s['rejected']} rejected ({s['rows_per_sec']:.0f} rows/s)")
+
+    result = import_file(args.target, args.file, args.chunk_rows, sheet_name=args.sheet,
+                         dry_run=args.dry_run, compact=not args.no_compact, on_batch=progress)
+    print(f"{'🔎 Dry run' if args.dry_run else '✅ Imported'} {result['imported']} of {result['read']} rows "
+          f"into {os.path.basename(result['file'])} in {result['seconds']:.1f} s "
+          f"({result['rows_per_sec']:.0f} rows/s); {result['duplicates']} duplicates, {result['rejected']} rejected")
+    if result["compact_seconds"]:
+        print(f"   workbook rewritten in {result['compact_seconds']:.1f} s")
+    if result["ignored_columns"]:
+        print(f"   ignored columns: {', '.join(result['ignored_columns'])}")
+    for r in result["rejected_samples"][:5]:
+        print(f"   rejected: {r}")
+    if result["flagged"]:
+        print(f"⚠️ {result['flagged']} imported readings are lower than the previous one or gained more "
+              f"hours than the calendar allows:")
+        for r in result["flagged_samples"][:5]:
+            print(f"   flagged: {r}")
@@ -0,0 +1,152 @@
+"""Rendered KPI charts, cached as PNG bytes.
+
+Figures are built with the object-oriented matplotlib API (never registered
+with pyplot), rendered once to PNG and released, so reruns neither redraw an
+unchanged chart nor accumulate figures. The dark theme is applied with a
+style context instead of plt.style.use, leaving global rcParams untouched.
+The key is a hash of the chart kind, its labels and the plotted values, so a
+new month or reading produces a new chart without explicit invalidation.
+"""
+import collections
+import hashlib
+import io
+import threading
+
+import matplotlib
+import matplotlib.style
+import numpy as np
+from matplotlib.figure import Figure
+
+import profiling
+
+STYLE = "dark_background"
+MAX_ENTRIES = 128
+
+_lock = threading.Lock()
+_cache = collections.OrderedDict()
+_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+def _key(kind, labels, x, y):
+    h = hashlib.sha1()
+    h.update(repr((kind, labels)).encode("utf-8"))
+    h.update(repr([str(v) for v in x]).encode("utf-8"))
+    h.update(np.asarray(y, dtype="float64").tobytes())
+    return h.hexdigest()
+
+
+def _cached(kind, key, draw):
+    with _lock:
+        png = _cache.get(key)
+        if png is not None:
+            _cache.move_to_end(key)
+            _stats["hits"] += 1
+            return png
+        _stats["misses"] += 1
+    with profiling.span(f"chart {kind}"), matplotlib.style.context(STYLE):
+        fig = draw()
+        buf = io.BytesIO()
+        fig.savefig(buf, format="png")
+    fig.clear()
+    png = buf.getvalue()
+    with _lock:
+        _cache[key] = png
+        while len(_cache) > MAX_ENTRIES:
+            _cache.popitem(last=False)
+            _stats["evictions"] += 1
+    return png
+
+
+def _ticks(ax, rotation, size, color):
+    ax.tick_params(axis="x", labelrotation=rotation, labelsize=size, colors=color)
+    ax.tick_params(axis="y", labelsize=size, colors=color)
+
+
+def _color_bars(bars, cmap, lo, hi):
+    colors = matplotlib.colormaps[cmap](np.linspace(lo, hi, len(bars)))
+    for bar, color in zip(bars, colors):
+        bar.set_color(color)
+
+
+def trend_png(months, values, kpi_name, machine):
+    """Line chart of one KPI across months for one machine."""
+    months, values = list(months), list(values)
+
+    def draw():
+        fig = Figure(figsize=(7, 3))
+        ax = fig.subplots()
+        ax.plot(months, values, marker="o", linewidth=2, color="#ffde59")
+        ax.set_xlabel("Month", fontsize=13, color="#ffd54f")
+        ax.set_ylabel(kpi_name, fontsize=13, color="#ffd54f")
+        ax.set_title(f"{kpi_name} Trend - {machine}", fontsize=15, color="#ffde59", fontweight="bold")
+        _ticks(ax, 35, 12, "#ffd54f")
+        ax.grid(True, linestyle="--", alpha=0.3, color="#444")
+        for i, v in enumerate(values):
+            ax.text(i, v, f"{v:.1f}", ha="center", va="bottom", fontsize=11, color="#fff")
+        fig.tight_layout()
+        return fig
+
+    return _cached("trend", _key("trend", (kpi_name, machine), months, values), draw)
+
+
+def running_hours_png(machines, hours, class_label, month):
+    """Running hours of every machine of a class in one month."""
+    machines, hours = list(machines), list(hours)
+
+    def draw():
+        fig = Figure(figsize=(10, 4))
+        ax = fig.subplots()
+        bars = ax.bar(machines, hours, width=0.6)
+        _color_bars(bars, "viridis", 0.1, 0.9)
+        for bar in bars:
+            height = bar.get_height()
+            ax.annotate(f"{height:.0f}", xy=(bar.get_x() + bar.get_width() / 2, height),
+                        xytext=(0, 6), textcoords="offset points",
+                        ha="center", va="bottom", fontsize=13, color="#ffd54f")
+        ax.set_xlabel(class_label, fontsize=14, color="#ffd54f")
+        ax.set_ylabel("Running Hours", fontsize=14, color="#ffd54f")
+        ax.set_title(f"Running Hours per {class_label} in {month}", fontsize=15, color="#ffde59", fontweight="bold")
+        _ticks(ax, 30, 12, "#ffd54f")
+        ax.grid(axis="y", linestyle="--", alpha=0.25, color="#444")
+        fig.tight_layout()
+        return fig
+
+    return _cached("running hours", _key("running", (class_label, month), machines, hours), draw)
+
+
+def total_hours_png(machines, hours, class_label, month):
+    """Total Hours of every machine of a class at the end of one month."""
+    machines, hours = list(machines), list(hours)
+
+    def draw():
+        fig = Figure(figsize=(11, 5))
+        ax = fig.subplots()
+        bars = ax.bar(machines, hours, width=0.65)
+        _color_bars(bars, "inferno", 0.12, 0.88)
+        for bar in bars:
+            height = bar.get_height()
+            ax.annotate(f"{height:.0f}", xy=(bar.get_x() + bar.get_width() / 2, height),
+                        xytext=(0, 10), textcoords="offset points",
+                        ha="center", va="bottom", fontsize=14, fontweight="bold", color="#fff")
+        ax.set_xlabel(class_label, fontsize=15, color="#f5f5f5", labelpad=8)
+        ax.set_ylabel("Total Hours", fontsize=15, color="#f5f5f5", labelpad=8)
+        ax.set_title(f"Total Hours per {class_label} in {month}", fontsize=18, color="#ffde59", pad=15, fontweight="bold")
+        _ticks(ax, 25, 13, "#ffd54f")
+        ax.spines["bottom"].set_color("#888")
+        ax.spines["left"].set_color("#888")
+        ax.grid(axis="y", linestyle="--", alpha=0.25, color="#eee")
+        fig.tight_layout()
+        return fig
+
+    return _cached("total hours", _key("total", (class_label, month), machines, hours), draw)
+
+
+def clear():
+    """Drop every cached chart (the next request for each is rendered again)."""
+    with _lock:
+        _cache.clear()
+
+
+def cache_stats():
+    with _lock:
+        return {**_stats, "entries": len(_cache), "bytes_held": sum(len(v) for v in _cache.values())}
@@ -0,0 +1,180 @@
+"""Columnar (Parquet) sidecars for the plant workbooks.
+
+Each workbook gets a typed Parquet copy next to it. Reads go to the Parquet
+file; the xlsx is only rewritten as an export. The Parquet schema metadata
+records the xlsx mtime/size the sidecar was built from, so a workbook edited
+by hand in Excel is detected and the sidecar rebuilt. Keeping it inside the
+one file means a reader that rebuilt from an older xlsx while a writer
+replaced it can only leave a sidecar that reads as stale, never one that
+claims the new xlsx.
+
+Both files also carry the journal stamp ("<id>:<offset>", see journal.py) of
+the journal bytes folded into them, in the Parquet schema metadata and in the
+xlsx core properties, so the stamp is replaced together with the data.
+
+    python columnar.py migrate [workbook ...]
+    python columnar.py check [workbook ...]
+
+Without workbook arguments both commands go over data_store.WORKBOOKS.
+"""
+import io
+import json
+import os
+import sys
+import zipfile
+from xml.etree import ElementTree
+
+import pandas as pd
+
+import schema
+from locking import atomic_output
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+# Bumped when schema.COLUMNS changes, so sidecars typed the old way are rebuilt.
+SCHEMA_VERSION = 1
+
+SOURCE_KEY = b"xlsx_source"
+STAMP_KEY = b"journal_folded"
+_IDENTIFIER = "{http://purl.org/dc/elements/1.1/}identifier"
+
+
+def sidecar_path(path):
+    return os.path.splitext(path)[0] + ".parquet"
+
+
+def _stat(path):
+    st = os.stat(path)
+    return {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+
+def _source(path, sheet_name):
+    return dict(_stat(path), sheet_name=sheet_name, schema=SCHEMA_VERSION)
+
+
+def _built_from(metadata):
+    try:
+        return json.loads((metadata or {})[SOURCE_KEY])
+    except (KeyError, ValueError):
+        return None
+
+
+def is_consistent(path, sheet_name="Sheet1"):
+    """True when the sidecar exists and was built from the current xlsx."""
+    try:
+        metadata = pq.read_schema(sidecar_path(path)).metadata
+    except (OSError, ValueError):
+        return False
+    return _built_from(metadata) == _source(path, sheet_name)
+
+
+def read_xlsx(path, sheet_name="Sheet1"):
+    """(DataFrame, journal stamp or None) from one read of the workbook."""
+    with open(path, "rb") as f:
+        data = f.read()
+    try:
+        core = ElementTree.fromstring(zipfile.ZipFile(io.BytesIO(data)).read("docProps/core.xml"))
+        stamp = core.findtext(_IDENTIFIER) or None
+    except (KeyError, zipfile.BadZipFile, ElementTree.ParseError):
+        stamp = None
+    return pd.read_excel(io.BytesIO(data), sheet_name=sheet_name), stamp
+
+
+def write_xlsx(path, df, sheet_name="Sheet1", stamp=None):
+    with atomic_output(path) as tmp:
+        with pd.ExcelWriter(tmp, engine="openpyxl") as writer:
+            schema.for_export(df).to_excel(writer, sheet_name=sheet_name, index=False)
+            if stamp:
+                writer.book.properties.identifier = stamp
+
+
+def _write_parquet(path, df, source, stamp):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[SOURCE_KEY] = json.dumps(source)
+    if stamp:
+        metadata[STAMP_KEY] = stamp
+    with atomic_output(sidecar_path(path)) as tmp:
+        pq.write_table(table.replace_schema_metadata(metadata), tmp)
+
+
+def _rebuild(path, sheet_name):
+    source = _source(path, sheet_name)  # before reading: a newer xlsx makes the sidecar stale
+    df, stamp = read_xlsx(path, sheet_name)
+    df = schema.apply(df)
+    try:
+        _write_parquet(path, df, source, stamp)
+    except OSError:
+        pass  # read-only folder: serve the xlsx without caching it
+    return df, stamp
+
+
+def rebuild(path, sheet_name="Sheet1"):
+    return _rebuild(path, sheet_name)[0]
+
+
+def read_stamped(path, sheet_name="Sheet1"):
+    """(typed table, journal stamp), rebuilding the sidecar first if the xlsx changed."""
+    try:
+        table = pq.read_table(sidecar_path(path))
+    except (OSError, ValueError):
+        return _rebuild(path, sheet_name)
+    metadata = table.schema.metadata or {}
+    if _built_from(metadata) != _source(path, sheet_name):
+        return _rebuild(path, sheet_name)
+    stamp = metadata.get(STAMP_KEY)
+    return table.to_pandas(), stamp.decode() if stamp else None
+
+
+def read(path, sheet_name="Sheet1"):
+    """Read the typed table, rebuilding the sidecar first if the xlsx changed."""
+    return read_stamped(path, sheet_name)[0]
+
+
+def write(path, df, sheet_name="Sheet1", stamp=None):
+    """Store df as the new table: the xlsx export, then its Parquet sidecar.
+
+    stamp records the journal bytes folded into df (data_store.compact).
+    """
+    df = schema.apply(df)
+    write_xlsx(path, df, sheet_name, stamp)
+    _write_parquet(path, df, _source(path, sheet_name), stamp)
+    return df
+
+
+def _workbooks():
+    import data_store  # data_store imports this module; the list is only needed by the commands
+    return data_store.WORKBOOKS
+
+
+def migrate(paths=None):
+    for path in paths or _workbooks():
+        df = rebuild(path)
+        print(f"✅ {path} -> {sidecar_path(path)} ({len(df)} rows)")
+
+
+def check(paths=None):
+    """Report stale sidecars and rebuild them. Returns the number rebuilt."""
+    rebuilt = 0
+    for path in paths or _workbooks():
+        if is_consistent(path):
+            print(f"✅ {path}: sidecar up to date")
+        else:
+            rebuild(path)
+            rebuilt += 1
+            print(f"🔁 {path}: xlsx changed outside the app, sidecar rebuilt")
+    return rebuilt
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] not in ("migrate", "check"):
+        print(__doc__)
+        sys.exit(2)
+    if sys.argv[1] == "migrate":
+        migrate(sys.argv[2:])
+    else:
+        check(sys.argv[2:])
@@ -0,0 +1,278 @@
+import os
+import threading
+import time
+
+import pandas as pd
+
+import columnar
+import journal
+import profiling
+import schema
+from locking import file_lock
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+COMPRESSOR_HOURS_FILE = "monthly_compressor_hours_fixed.xlsx"
+COOLING_TOWER_HOURS_FILE = "monthly_cooling_tower_hours_fixed.xlsx"
+MAINTENANCE_LOG_FILE = "maintenance_log_data.xlsx"
+CRITICAL_SPARE_PARTS_FILE = "critical_critical_spare_parts.xlsx"
+SPARE_PARTS_TRANSACTIONS_FILE = "spare_parts_transactions.xlsx"
+MAINTENANCE_PARTS_FILE = "maintenance_parts_lists.xlsx"
+# Every workbook the dashboard reads through read_table (and so through a sidecar).
+WORKBOOKS = [
+    COMPRESSOR_HOURS_FILE, COOLING_TOWER_HOURS_FILE, MAINTENANCE_LOG_FILE,
+    CRITICAL_SPARE_PARTS_FILE, SPARE_PARTS_TRANSACTIONS_FILE, MAINTENANCE_PARTS_FILE,
+]
+
+# Journals larger than this, or older than COMPACT_MAX_AGE_S, are folded back
+# into the workbook in the background, so the xlsx people open in Excel lags
+# the dashboard by minutes, not by hundreds of saves.
+COMPACT_THRESHOLD_BYTES = 64 * 1024
+COMPACT_MAX_AGE_S = 10 * 60
+COMPACT_CHECK_EVERY_S = 60
+
+# --- كاش الجداول: مفتاحه المسار + mtime + الحجم ---
+# The cache lives in this module (not in m.py) so it survives Streamlit reruns,
+# which re-execute the script but keep imported modules in sys.modules.
+_lock = threading.Lock()
+_cache = {}
+_base_cache = {}
+_derived = {}
+_stats = {"hits": 0, "misses": 0, "invalidations": 0, "compactions": 0}
+_compacting = set()
+_due_checked = None  # time.monotonic() of the last compact_due() scan
+
+
+def _file_key(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def base_version(path):
+    """Identity (mtime_ns, size) of the workbook itself, ignoring its journal; None if missing."""
+    return _file_key(path)
+
+
+def row_hash_sum(df, columns, start=0, stop=None):
+    """Wrapping uint64 sum of per-row hashes of df.iloc[start:stop][columns].
+
+    Caches built over an append-only table keep this sum of the rows they
+    folded in. When base_version() changes (a compaction, or a hand edit in
+    Excel) they recompute it over the same rows: equal means the same rows,
+    so only the new ones need folding. Sums of consecutive ranges add up.
+    """
+    rows = df.iloc[start:stop][[c for c in columns if c in df.columns]]
+    if rows.empty:
+        return 0
+    if "Date" in rows.columns:  # same instants hash the same whatever the stored unit
+        rows = rows.assign(Date=rows["Date"].astype("datetime64[ns]"))
+    return int(pd.util.hash_pandas_object(rows, index=False).to_numpy().sum(dtype="uint64"))
+
+
+def _table_key(path):
+    return (_file_key(path), _file_key(journal.journal_path(path)))
+
+
+def _load_base(path, sheet_name):
+    """(typed workbook table, journal stamp of the rows folded into it)."""
+    cache_id = (os.path.abspath(path), sheet_name)
+    key = _file_key(path)
+    with _lock:
+        entry = _base_cache.get(cache_id)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+    if HAS_PYARROW:
+        base = columnar.read_stamped(path, sheet_name)
+    else:
+        df, stamp = columnar.read_xlsx(path, sheet_name)
+        base = (schema.apply(df), stamp)
+    with _lock:
+        _base_cache[cache_id] = (key, base)
+    return base
+
+
+def _merge(base, rows):
+    if rows.empty:
+        return base
+    # Typing the (small) journal first lets concat keep the base's dtypes, so
+    # the final apply() has nothing left to convert.
+    return schema.apply(pd.concat([base, schema.apply(rows)], ignore_index=True))
+
+
+def read_table(path, sheet_name="Sheet1"):
+    """Return the workbook table merged with its journal.
+
+    Re-reads from disk only when the workbook or its journal changed. Takes
+    no lock: the journal is read before the workbook, and the workbook's
+    journal stamp says which of those bytes a compaction already folded in.
+    """
+    cache_id = (os.path.abspath(path), sheet_name)
+    key = _table_key(path)
+    with _lock:
+        entry = _cache.get(cache_id)
+        if entry is not None and entry[0] == key:
+            _stats["hits"] += 1
+            return entry[1].copy(deep=False)
+
+    with profiling.span(f"load {os.path.basename(path)}") as s:
+        key = _table_key(path)
+        data = journal.snapshot(path)
+        base, stamp = _load_base(path, sheet_name)
+        rows, _, _ = journal.parse(data, stamp)
+        df = _merge(base, rows)
+        s.rows = len(df)
+    with _lock:
+        _stats["misses"] += 1
+        _cache[cache_id] = (key, df)
+    return df.copy(deep=False)
+
+
+def derived(path, name, build, sheet_name="Sheet1"):
+    """Return build(table), recomputed only when the table itself changes.
+
+    Use for indexes and aggregates that every rerun would otherwise rebuild.
+    """
+    cache_id = (os.path.abspath(path), sheet_name, name)
+    key = _table_key(path)
+    with _lock:
+        entry = _derived.get(cache_id)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+    table = read_table(path, sheet_name)
+    with profiling.span(f"build {name}", rows=len(table)):
+        value = build(table)
+    with _lock:
+        _derived[cache_id] = (key, value)
+    return value
+
+
+def write_table(path, df, sheet_name="Sheet1", stamp=None):
+    """Replace the table on disk and seed the base cache with the written frame.
+
+    Callers that read-modify-write must hold locking.file_lock(path). stamp
+    records the journal bytes folded into df (see compact).
+    """
+    if HAS_PYARROW:
+        df = columnar.write(path, df, sheet_name, stamp)
+    else:
+        df = schema.apply(df)
+        columnar.write_xlsx(path, df, sheet_name, stamp)
+    with _lock:
+        _base_cache[(os.path.abspath(path), sheet_name)] = (_file_key(path), (df, stamp))
+    return df
+
+
+def append_rows(path, records, sheet_name="Sheet1", compact=True):
+    """Append rows through the journal; the workbook itself is not rewritten.
+
+    compact=False leaves a large journal for the caller to compact() once
+    (bulk imports committing many batches).
+    """
+    with file_lock(path):
+        n = journal.append(path, records)
+    if compact and _needs_compaction(path):
+        compact_in_background(path, sheet_name)
+    return n
+
+
+def _needs_compaction(path):
+    age = journal.age(path)
+    return journal.size(path) >= COMPACT_THRESHOLD_BYTES or (age is not None and age >= COMPACT_MAX_AGE_S)
+
+
+def compact_due(paths=None, sheet_name="Sheet1"):
+    """Compact, in the background, the journals of paths (default WORKBOOKS)
+    that are too large or older than COMPACT_MAX_AGE_S.
+
+    m.py calls this on every rerun; it looks at the journals at most every
+    COMPACT_CHECK_EVERY_S seconds. The first call in a process (the app's
+    startup) compacts every journal that has rows, whatever its age.
+    """
+    global _due_checked
+    now = time.monotonic()
+    with _lock:
+        startup = _due_checked is None
+        if not startup and now - _due_checked < COMPACT_CHECK_EVERY_S:
+            return
+        _due_checked = now
+    for path in paths or WORKBOOKS:
+        if journal.size(path) and (startup or _needs_compaction(path)):
+            compact_in_background(path, sheet_name)
+
+
+def compact(path, sheet_name="Sheet1"):
+    """Fold the journal into the workbook. Returns the number of rows folded.
+
+    The workbook is stamped with the journal id and offset it folded, so a
+    crash before the journal is truncated does not fold the rows twice.
+    """
+    with file_lock(path):
+        data = journal.snapshot(path)
+        if not data:
+            return 0
+        base, stamp = _load_base(path, sheet_name)
+        rows, offset, jid = journal.parse(data, stamp)
+        if not rows.empty:
+            write_table(path, _merge(base, rows), sheet_name, stamp=f"{jid}:{offset}")
+        journal.truncate(path, offset)
+    if rows.empty:
+        return 0  # only bytes an interrupted compaction had already folded
+    with _lock:
+        _stats["compactions"] += 1
+    return len(rows)
+
+
+def compact_in_background(path, sheet_name="Sheet1"):
+    target = os.path.abspath(path)
+    with _lock:
+        if target in _compacting:
+            return
+        _compacting.add(target)
+
+    def run():
+        try:
+            compact(path, sheet_name)
+        finally:
+            with _lock:
+                _compacting.discard(target)
+
+    threading.Thread(target=run, name=f"compact:{os.path.basename(path)}", daemon=True).start()
+
+
+def invalidate(path=None):
+    """Drop cached tables for one workbook, or for all workbooks if path is None."""
+    with _lock:
+        if path is None:
+            dropped = list(_cache)
+            _base_cache.clear()
+            _derived.clear()
+        else:
+            target = os.path.abspath(path)
+            dropped = [cache_id for cache_id in _cache if cache_id[0] == target]
+            for cache_id in [c for c in _base_cache if c[0] == target]:
+                del _base_cache[cache_id]
+            for cache_id in [c for c in _derived if c[0] == target]:
+                del _derived[cache_id]
+        for cache_id in dropped:
+            del _cache[cache_id]
+        _stats["invalidations"] += len(dropped)
+    return len(dropped)
+
+
+def memory_usage():
+    """{workbook: {"rows", "mb"}} for every table currently cached."""
+    with _lock:
+        tables = [(cache_id[0], entry[1]) for cache_id, entry in _cache.items()]
+    return {os.path.basename(path): {"rows": len(df), "mb": schema.memory_mb(df)} for path, df in tables}
+
+
+def cache_stats():
+    with _lock:
+        return dict(_stats, entries=len(_cache))
@@ -0,0 +1,90 @@
+"""Equipment classes and the unified equipment-hours table.
+
+Every class is an hours workbook with its own machine column. table() brings
+them together as one typed frame with an "Equipment" machine column and an
+"Equipment Class" column, which the KPI cube, planner and forecast read with
+key="Equipment". Adding a class means adding an EQUIPMENT_CLASSES entry.
+"""
+import pandas as pd
+
+import data_store
+import kpi_store
+import planner
+from schema import MACHINE_LIST  # noqa: F401  (re-exported for the tabs)
+
+KEY = "Equipment"
+CLASS_COLUMN = "Equipment Class"
+
+# file: hours workbook, column: its machine column, date_column: "Date" for
+# dated readings or "Month" for monthly sheets, intervals: maintenance
+# intervals in hours (empty when the class has no planned services).
+EQUIPMENT_CLASSES = {
+    "Compressor": {
+        "file": data_store.COMPRESSOR_HOURS_FILE,
+        "column": "Compressor",
+        "date_column": "Date",
+        "machines": MACHINE_LIST[:13],
+        "intervals": planner.DEFAULT_INTERVALS,
+    },
+    "Cooling Tower": {
+        "file": data_store.COOLING_TOWER_HOURS_FILE,
+        "column": "Cooling Tower",
+        "date_column": "Month",
+        "machines": MACHINE_LIST[13:],
+        "intervals": (),
+    },
+}
+
+
+def normalize(df, equipment_class):
+    """One class's hours table with the machine column as Equipment and a typed Date."""
+    spec = EQUIPMENT_CLASSES[equipment_class]
+    out = df.rename(columns={spec["column"]: KEY})
+    if KEY not in out.columns:
+        out[KEY] = pd.Series(dtype="object")
+    if "Date" not in out.columns:
+        out["Date"] = pd.to_datetime(out.get(spec["date_column"]), errors="coerce")
+    out[KEY] = out[KEY].astype("object")
+    out[CLASS_COLUMN] = equipment_class
+    return out
+
+
+def class_table(equipment_class):
+    """normalize() of the class's workbook, cached until the workbook changes."""
+    path = EQUIPMENT_CLASSES[equipment_class]["file"]
+    return data_store.derived(path, "equipment", lambda df: normalize(df, equipment_class))
+
+
+def table(classes=None):
+    """All equipment hours in one frame; Equipment is categorical over MACHINE_LIST."""
+    frames = [class_table(c) for c in (classes or EQUIPMENT_CLASSES)]
+    out = pd.concat(frames, ignore_index=True)
+    out[KEY] = pd.Categorical(out[KEY], categories=MACHINE_LIST)
+    out[CLASS_COLUMN] = pd.Categorical(out[CLASS_COLUMN], categories=list(EQUIPMENT_CLASSES))
+    return out
+
+
+def last_readings(equipment_class):
+    """kpi_store.last_readings for the class's workbook."""
+    path = EQUIPMENT_CLASSES[equipment_class]["file"]
+    return kpi_store.last_readings(path, key=KEY, load=lambda _path: class_table(equipment_class))
+
+
+def reading_row(equipment_class, date, machine, total_hours):
+    """A Total Hours reading in the layout of the class's workbook."""
+    spec = EQUIPMENT_CLASSES[equipment_class]
+    return {spec["date_column"]: date, spec["column"]: machine, "Total Hours": total_hours}
+
+
+def planned_classes():
+    return [(c, spec) for c, spec in EQUIPMENT_CLASSES.items() if spec["intervals"]]
+
+
+def kpi_cube(classes=None):
+    """kpi.kpi_cube over every class (key="Equipment"), each materialized incrementally."""
+    cubes = []
+    for c in classes or EQUIPMENT_CLASSES:
+        path = EQUIPMENT_CLASSES[c]["file"]
+        cube = kpi_store.materialized_cube(path, key=KEY, load=lambda _path, c=c: class_table(c))
+        cubes.append(cube.assign(**{CLASS_COLUMN: c}))
+    return pd.concat(cubes, ignore_index=True)
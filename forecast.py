@@ -0,0 +1,130 @@
+"""Spare-part demand forecast linked to the maintenance planner.
+
+1. hours_per_month: each compressor's measured running rate from its recent
+   Total Hours readings.
+2. due_schedule: every maintenance of every interval falling inside the
+   horizon, with its projected date.
+3. order_plan: due events joined with the per-interval parts lists and the
+   current stock, bucketed by month, giving what to order and when.
+
+All steps are vectorized across the fleet.
+"""
+import numpy as np
+import pandas as pd
+
+import inventory
+import planner
+
+DAYS_PER_MONTH = 365.25 / 12
+RATE_WINDOW_DAYS = 365
+MIN_SPAN_DAYS = 20
+HORIZON_MONTHS = 12
+PARTS_LIST_COLUMNS = ["Interval", "Part Number", "Part Name", "Quantity", "Compressor"]
+PLAN_COLUMNS = ["Bucket", "Part Number", "Part Name", "Demand", "Cumulative Demand", "Stock",
+                "Order Quantity", "First Due"]
+
+
+def hours_per_month(df, window_days=RATE_WINDOW_DAYS, default=planner.HOURS_PER_MONTH,
+                    key="Compressor"):
+    """Running hours per month per machine over the last window_days of readings.
+
+    Machines with less than MIN_SPAN_DAYS of history get the default rate.
+    """
+    readings = df.loc[df["Total Hours"].notna() & df[key].notna() & df["Date"].notna(),
+                      [key, "Date", "Total Hours"]]
+    readings = readings.assign(**{key: readings[key].astype(str)})
+    last_date = readings.groupby(key)["Date"].transform("max")
+    recent = readings[readings["Date"] >= last_date - pd.Timedelta(days=window_days)]
+    g = recent.sort_values("Date", kind="stable").groupby(key)
+    span_days = (g["Date"].last() - g["Date"].first()).dt.total_seconds() / 86400
+    gained = g["Total Hours"].last() - g["Total Hours"].first()
+    rate = (gained / span_days * DAYS_PER_MONTH).where(span_days >= MIN_SPAN_DAYS)
+    return rate.clip(lower=0).fillna(default).rename("Hours per Month")
+
+
+def due_schedule(df, intervals=planner.DEFAULT_INTERVALS, machines=None,
+                 horizon_months=HORIZON_MONTHS, rates=None, key="Compressor"):
+    """One row per (machine, interval, cycle) due within horizon_months.
+
+    Cycles repeat every interval hours after the next due, so a 5000h service
+    can appear twice in a year on a busy machine.
+    """
+    if rates is None:
+        rates = hours_per_month(df, key=key)
+    result = planner.remaining_to_next_maintenance(df, intervals, machines, hours_per_month=rates, key=key)
+    last_reading = (df.loc[df["Total Hours"].notna()]
+                      .assign(**{key: lambda d: d[key].astype(str)})
+                      .groupby(key)["Date"].max())
+
+    long = pd.DataFrame({
+        key: np.repeat(result[key].to_numpy(), len(intervals)),
+        "Interval": np.tile(np.asarray(intervals, dtype="int64"), len(result)),
+        "Next Due Hours": result[[f"Next {mt}h At" for mt in intervals]].to_numpy().ravel(),
+        "Remaining": result[[f"Remaining to {mt}h" for mt in intervals]].to_numpy().ravel(),
+    }).dropna(subset=["Remaining"])
+    long["Hours per Month"] = long[key].map(rates).to_numpy(dtype="float64")
+    long = long[long["Hours per Month"] > 0]
+
+    budget = long["Hours per Month"].to_numpy() * horizon_months
+    interval = long["Interval"].to_numpy(dtype="float64")
+    cycles = int(np.ceil(np.max((budget - long["Remaining"].to_numpy()) / interval, initial=0))) + 1
+    k = np.arange(cycles)
+    remaining = long["Remaining"].to_numpy()[:, None] + k[None, :] * interval[:, None]
+    months = remaining / long["Hours per Month"].to_numpy()[:, None]
+    # Overdue services (negative remaining) are due now; later cycles must fall in the horizon.
+    inside = (months <= horizon_months) & ((k[None, :] == 0) | (months > 0))
+    rows, cyc = np.nonzero(inside)
+
+    out = long.iloc[rows].reset_index(drop=True)
+    out["Cycle"] = cyc
+    out["Due At Hours"] = out["Next Due Hours"] + cyc * out["Interval"]
+    out["Months to Due"] = np.maximum(months[rows, cyc], 0)
+    as_of = out[key].map(last_reading)
+    out["Due Date"] = (as_of + pd.to_timedelta(out["Months to Due"] * DAYS_PER_MONTH, unit="D")).dt.normalize()
+    return out.drop(columns=["Next Due Hours", "Remaining"]).sort_values(["Due Date", key]).reset_index(drop=True)
+
+
+def normalize_parts_lists(parts_lists):
+    """Interval as int hours, Compressor blank meaning every compressor."""
+    if parts_lists.empty:
+        return pd.DataFrame(columns=PARTS_LIST_COLUMNS)
+    out = parts_lists.reindex(columns=PARTS_LIST_COLUMNS).copy()
+    out["Interval"] = planner.interval_hours(out["Interval"])
+    out["Quantity"] = pd.to_numeric(out["Quantity"], errors="coerce").fillna(0)
+    out["Compressor"] = out["Compressor"].astype("object").where(out["Compressor"].notna(), None)
+    return out.dropna(subset=["Interval", "Part Number"])
+
+
+def order_plan(schedule, parts_lists, stock, freq="M", key="Compressor"):
+    """Parts to order per month bucket so that stock covers every due service.
+
+    stock is inventory.stock_table output (Part Number, Current Stock). The
+    parts lists' Compressor column is matched against the schedule's key.
+    Returns Bucket, Part Number, Part Name, Demand, Cumulative Demand, Stock,
+    Order Quantity and the first Due Date needing the part in that bucket.
+    """
+    parts = normalize_parts_lists(parts_lists)
+    if schedule.empty or parts.empty:
+        return pd.DataFrame(columns=PLAN_COLUMNS)
+    parts = parts.assign(**{"Part Number": inventory.part_key(parts["Part Number"]).to_numpy()})
+    parts = parts.rename(columns={"Compressor": key})
+    generic = parts[parts[key].isna()].drop(columns=key)
+    specific = parts[parts[key].notna()]
+    demand = pd.concat([
+        schedule.merge(generic, on="Interval"),
+        schedule.merge(specific, on=["Interval", key]),
+    ], ignore_index=True)
+    if demand.empty:
+        return pd.DataFrame(columns=PLAN_COLUMNS)
+    demand["Bucket"] = demand["Due Date"].dt.to_period(freq).astype(str)
+
+    plan = (demand.groupby(["Part Number", "Bucket"], sort=True)
+                  .agg(**{"Part Name": ("Part Name", "first"), "Demand": ("Quantity", "sum"),
+                          "First Due": ("Due Date", "min")})
+                  .reset_index())
+    on_hand = stock.set_index("Part Number")["Current Stock"] if not stock.empty else pd.Series(dtype="float64")
+    plan["Stock"] = plan["Part Number"].map(on_hand).fillna(0).to_numpy(dtype="float64")
+    plan["Cumulative Demand"] = plan.groupby("Part Number")["Demand"].cumsum()
+    shortfall = (plan["Cumulative Demand"] - plan["Stock"]).clip(lower=0)
+    plan["Order Quantity"] = shortfall - shortfall.groupby(plan["Part Number"]).shift(fill_value=0)
+    return plan[PLAN_COLUMNS].sort_values(["Bucket", "Part Number"]).reset_index(drop=True)
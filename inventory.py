@@ -0,0 +1,183 @@
+"""Spare-parts stock from the critical parts list and the transactions ledger.
+
+Stock per part = opening Quantity in the critical list + signed transaction
+quantities. The ledger is append-only, so the net movement per part is kept
+between reruns and only rows added since the last call are folded in. The
+date-sorted running balances are kept the same way: new rows dated on or
+after the latest one continue from each part's last movement; a back-dated
+or undated row makes the next read rebuild them. When the workbook itself
+changes (a compaction, or an edit in Excel), the rows already folded in are
+rehashed and any difference rebuilds everything.
+"""
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+import data_store
+import profiling
+
+IN_TYPES = {"in", "receive", "received", "receipt", "return", "returned"}
+OUT_TYPES = {"out", "issue", "issued", "consume", "consumed", "used"}
+TRANSACTION_TYPES = ["In", "Out"]
+LEDGER_COLUMNS = ["Part Number", "Transaction Type", "Quantity", "Date"]
+
+
+def part_key(values):
+    """Part numbers come back as ints, floats or strings depending on the sheet."""
+    s = pd.Series(values)
+    if pd.api.types.is_integer_dtype(s.dtype):
+        return s.astype(str)
+    num = pd.to_numeric(s, errors="coerce")
+    as_int = num.dropna().astype("int64").astype(str)
+    return s.astype(str).str.strip().mask(num.notna(), as_int.reindex(s.index))
+
+
+def signed_quantity(transactions):
+    # Few distinct types: normalize the uniques, not every row.
+    codes, kinds = pd.factorize(transactions["Transaction Type"].astype(str))
+    kinds = pd.Index(kinds).str.strip().str.lower()
+    kind_sign = np.select([kinds.isin(IN_TYPES), kinds.isin(OUT_TYPES)], [1.0, -1.0], 0.0)
+    sign = np.append(kind_sign, 0.0)[codes]
+    qty = pd.to_numeric(transactions["Quantity"], errors="coerce").fillna(0).to_numpy(dtype="float64")
+    return pd.Series(sign * qty, index=transactions.index)
+
+
+def net_movements(transactions):
+    if transactions.empty:
+        return pd.Series(dtype="float64")
+    return signed_quantity(transactions).groupby(part_key(transactions["Part Number"]).to_numpy()).sum()
+
+
+def _moved(transactions, start=None):
+    """transactions sorted by date with _part and _moved, the part's cumulative
+    movement after each row, continuing from start (net movement per part)."""
+    ledger = transactions.assign(_part=part_key(transactions["Part Number"]).to_numpy(),
+                                 _moved=signed_quantity(transactions))
+    ledger = ledger.sort_values("Date", kind="stable")
+    ledger["_moved"] = ledger.groupby("_part")["_moved"].cumsum()
+    if start is not None and not start.empty:
+        ledger["_moved"] += ledger["_part"].map(start).fillna(0)
+    return ledger
+
+
+def _with_balance(moved, opening):
+    balance = moved["_moved"] + moved["_part"].map(opening).fillna(0)
+    return moved.assign(Balance=balance).drop(columns=["_part", "_moved"])
+
+
+def running_balances(critical, transactions):
+    """Ledger sorted by date with the running stock of the part after each row."""
+    if transactions.empty:
+        return transactions.assign(Balance=pd.Series(dtype="float64"))
+    return _with_balance(_moved(transactions), _opening(critical))
+
+
+def _opening(critical):
+    qty = pd.to_numeric(critical["Quantity"], errors="coerce").fillna(0)
+    return qty.groupby(part_key(critical["Part Number"]).to_numpy()).sum()
+
+
+def stock_table(critical, net):
+    """One row per part: opening, net movement, current stock and the minimum flag."""
+    parts = critical.assign(**{"Part Number": part_key(critical["Part Number"]).to_numpy()})
+    parts = parts.drop_duplicates("Part Number").set_index("Part Number")
+    opening = _opening(critical)
+    index = parts.index.union(net.index)
+    out = pd.DataFrame(index=index)
+    out.index.name = "Part Number"
+    out["Part Name"] = parts["Part Name"].reindex(index)
+    out["Opening"] = opening.reindex(index).fillna(0)
+    out["Net Movement"] = net.reindex(index).fillna(0)
+    out["Current Stock"] = out["Opening"] + out["Net Movement"]
+    out["Minimum Stock"] = pd.to_numeric(parts["Minimum Stock"], errors="coerce").reindex(index)
+    out["Below Minimum"] = out["Current Stock"] < out["Minimum Stock"]
+    return out.reset_index()
+
+
+class Ledger:
+    """Net movement per part and running balances, extended with new ledger rows only."""
+
+    def __init__(self):
+        self.net = pd.Series(dtype="float64")
+        self.rows_seen = 0
+        self.row_sum = 0  # data_store.row_hash_sum of the rows folded in
+        self.base = None
+        self._balances = None  # (opening, running_balances frame), built on first balances()
+
+    def update(self, transactions, base=None):
+        """Fold in rows past rows_seen. Returns rows folded.
+
+        base is data_store.base_version() of the workbook, taken before the
+        table was read. While it is unchanged only the journal grew; when it
+        changes the folded rows are checked and an edit rebuilds.
+        """
+        stale = len(transactions) < self.rows_seen
+        if base != self.base and not stale:
+            stale = data_store.row_hash_sum(transactions, LEDGER_COLUMNS, 0, self.rows_seen) != self.row_sum
+        if stale:
+            self.net, self.rows_seen, self.row_sum, self._balances = pd.Series(dtype="float64"), 0, 0, None
+        self.base = base
+        new = transactions.iloc[self.rows_seen:]
+        if not new.empty:
+            self._extend_balances(new)
+            self.net = self.net.add(net_movements(new), fill_value=0)
+            self.row_sum = (self.row_sum + data_store.row_hash_sum(new, LEDGER_COLUMNS)) % 2 ** 64
+        self.rows_seen = len(transactions)
+        return len(new)
+
+    def _extend_balances(self, new):
+        if self._balances is None:
+            return
+        opening, frame = self._balances
+        dates = new["Date"]
+        last = frame["Date"].iloc[-1] if len(frame) else None
+        if dates.isna().any() or (last is not None and (pd.isna(last) or (dates < last).any())):
+            self._balances = None  # undated or back-dated: later balances move, rebuild on read
+            return
+        self._balances = (opening, pd.concat([frame, _with_balance(_moved(new, self.net), opening)]))
+
+    def balances(self, transactions, opening):
+        """running_balances after update(transactions); rebuilt only when a
+        back-dated row or a change to the opening stock requires it."""
+        if self._balances is not None and self._balances[0].equals(opening):
+            return self._balances[1]
+        if transactions.empty:
+            frame = transactions.assign(Balance=pd.Series(dtype="float64"))
+        else:
+            frame = _with_balance(_moved(transactions), opening)
+        self._balances = (opening, frame)
+        return frame
+
+
+_lock = threading.Lock()
+_ledgers = {}
+
+
+def ledger_balances(critical_path=data_store.CRITICAL_SPARE_PARTS_FILE,
+                    transactions_path=data_store.SPARE_PARTS_TRANSACTIONS_FILE):
+    """running_balances for the workbooks, folding in only new transactions."""
+    critical = data_store.read_table(critical_path)
+    base = data_store.base_version(transactions_path)
+    transactions = data_store.read_table(transactions_path)
+    with profiling.span("ledger balances", rows=len(transactions)):
+        opening = _opening(critical)
+        with _lock:
+            ledger = _ledgers.setdefault(os.path.abspath(transactions_path), Ledger())
+            ledger.update(transactions, base)
+            return ledger.balances(transactions, opening)
+
+
+def current_stock(critical_path=data_store.CRITICAL_SPARE_PARTS_FILE,
+                  transactions_path=data_store.SPARE_PARTS_TRANSACTIONS_FILE):
+    """stock_table for the workbooks, folding in only new transactions."""
+    critical = data_store.read_table(critical_path)
+    base = data_store.base_version(transactions_path)
+    transactions = data_store.read_table(transactions_path)
+    with profiling.span("stock", rows=len(transactions)):
+        with _lock:
+            ledger = _ledgers.setdefault(os.path.abspath(transactions_path), Ledger())
+            ledger.update(transactions, base)
+            net = ledger.net
+        return stock_table(critical, net)
@@ -0,0 +1,126 @@
+"""Append-only JSONL journal kept next to a workbook.
+
+A save appends one line per row, so its cost does not depend on how much
+history the workbook holds. Readers merge the journal onto the base table and
+compaction folds it back into the workbook (see data_store.compact).
+
+Every journal file starts with a header line carrying a random id, and the
+compacted workbook records "<id>:<offset>" of the bytes it folded in. If a
+compaction stops after writing the workbook and before truncating the
+journal, the next read skips those bytes instead of adding the rows twice.
+Truncating starts a new id, so the old stamp no longer matches. The header
+also records when the file was started, which data_store uses to compact
+journals that have waited too long.
+"""
+import datetime
+import json
+import os
+import time
+import uuid
+
+import pandas as pd
+
+from locking import atomic_output
+
+
+def journal_path(path):
+    return os.path.splitext(path)[0] + ".journal.jsonl"
+
+
+def _encode(value):
+    if isinstance(value, (datetime.date, datetime.datetime, pd.Timestamp)):
+        return value.isoformat()
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"Cannot journal value of type {type(value).__name__}")
+
+
+def _header():
+    return (json.dumps({"_journal": uuid.uuid4().hex, "created": time.time()}) + "\n").encode("utf-8")
+
+
+def _header_id(data):
+    """(journal id, header length) of the snapshot data; (None, 0) while the header is still being written."""
+    first = data[:data.find(b"\n") + 1]
+    if first.startswith(b'{"_journal"'):
+        return json.loads(first)["_journal"], len(first)
+    return None, 0
+
+
+def append(path, records):
+    """Append records (a list of dicts) to the journal of the given workbook.
+
+    Callers hold locking.file_lock(path) so appends never interleave with a
+    compaction truncating the journal.
+    """
+    lines = "".join(json.dumps(r, default=_encode, ensure_ascii=False) + "\n" for r in records)
+    with open(journal_path(path), "ab") as f:
+        if f.tell() == 0:
+            f.write(_header())
+        f.write(lines.encode("utf-8"))
+        f.flush()
+        os.fsync(f.fileno())
+    return len(records)
+
+
+def snapshot(path):
+    """The journal's bytes as they are now; b"" if there is none."""
+    try:
+        with open(journal_path(path), "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return b""
+
+
+def parse(data, folded=None):
+    """Return (rows DataFrame, byte offset read up to, journal id) for a snapshot.
+
+    folded is the "<id>:<offset>" stamp of the workbook; when it names this
+    journal, the rows up to offset are already in the workbook and skipped.
+    """
+    jid, start = _header_id(data)
+    if jid is not None and folded:
+        folded_id, _, offset = folded.rpartition(":")
+        if folded_id == jid:
+            start = max(start, int(offset))
+    # A writer may be mid-append; only consume complete lines.
+    end = data.rfind(b"\n") + 1
+    records = [json.loads(line) for line in data[start:max(start, end)].decode("utf-8").splitlines() if line.strip()]
+    return pd.DataFrame.from_records(records), end, jid
+
+
+def read(path, folded=None):
+    """parse() of the journal of the given workbook. Empty frame if no journal."""
+    return parse(snapshot(path), folded)
+
+
+def age(path):
+    """Seconds since the journal was started (or last truncated); None if there is none."""
+    try:
+        with open(journal_path(path), "rb") as f:
+            first = f.readline()
+        return time.time() - json.loads(first)["created"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def size(path):
+    try:
+        return os.path.getsize(journal_path(path))
+    except FileNotFoundError:
+        return 0
+
+
+def truncate(path, offset):
+    """Drop the first offset bytes (already compacted), keeping later appends
+    under a new journal id."""
+    jpath = journal_path(path)
+    with open(jpath, "rb") as f:
+        data = f.read()
+    rest = data[max(offset, _header_id(data)[1]):]
+    if rest:
+        with atomic_output(jpath) as tmp:
+            with open(tmp, "wb") as f:
+                f.write(_header() + rest)
+    else:
+        os.remove(jpath)
@@ -0,0 +1,87 @@
+"""Equipment KPIs (running hours, downtime, faults, availability, MTTR, MTBF).
+
+kpi_cube computes every machine x month cell in one vectorized pass; the
+KPIs tab then only slices the cube. key names the machine column
+("Compressor" in the compressor workbook, "Equipment" in the unified table).
+"""
+import numpy as np
+import pandas as pd
+
+DOWNTIME_COL = "DOWN TIME (HRS)"
+FAULTS_COL = "NO. OF FAULTS"
+CUBE_COLUMNS = ["Running Hours", "Downtime", "Faults", "Total Hours",
+                "Availability", "MTTR", "MTBF"]
+
+
+def running_hours(df, key="Compressor"):
+    """Per-row running hours: the Total Hours increase since the previous reading
+    of the same machine (0 for first readings and rows without a reading)."""
+    readings = df.loc[df["Total Hours"].notna(), [key, "Date", "Total Hours"]]
+    readings = readings.sort_values([key, "Date"], kind="stable")
+    diffs = readings.groupby(key, observed=True)["Total Hours"].diff().astype("float64")
+    return diffs.reindex(df.index).fillna(0.0)
+
+
+def _safe_div(num, den):
+    num = np.asarray(num, dtype="float64")
+    den = np.asarray(den, dtype="float64")
+    out = np.zeros_like(num)
+    np.divide(num, den, out=out, where=den > 0)
+    return out
+
+
+def add_ratios(frame):
+    """Availability (%), MTTR and MTBF from summed hours, downtime and faults."""
+    run = frame["Running Hours"].to_numpy(dtype="float64")
+    down = frame["Downtime"].to_numpy(dtype="float64")
+    faults = frame["Faults"].to_numpy(dtype="float64")
+    frame["Availability"] = _safe_div(run - down, run) * 100
+    frame["MTTR"] = _safe_div(down, faults)
+    frame["MTBF"] = _safe_div(run, faults)
+    return frame
+
+
+def monthly_sums(rows, running, key="Compressor"):
+    """Sum running hours, downtime and faults (and max Total Hours) per
+    (key, Month), indexed by those two keys."""
+    dates = rows["Date"]
+    keep = dates.notna() & rows[key].notna()
+    work = pd.DataFrame({
+        key: rows[key].astype(str),
+        "Month": dates.dt.to_period("M").astype(str),
+        "Running Hours": running,
+        "Downtime": rows[DOWNTIME_COL].fillna(0).astype("float64") if DOWNTIME_COL in rows.columns else 0.0,
+        "Faults": rows[FAULTS_COL].fillna(0).astype("float64") if FAULTS_COL in rows.columns else 0.0,
+        "Total Hours": rows["Total Hours"],
+    })[keep]
+    return (work.groupby([key, "Month"], sort=True)
+                .agg({"Running Hours": "sum", "Downtime": "sum", "Faults": "sum",
+                      "Total Hours": "max"}))
+
+
+def kpi_cube(df, key="Compressor"):
+    """One row per (key, Month) with all KPI columns."""
+    return add_ratios(monthly_sums(df, running_hours(df, key), key).reset_index())
+
+
+def summarize(cube, machine, month="All", key="Compressor"):
+    """Card values for one machine, over one month or all months."""
+    rows = cube[cube[key] == machine]
+    if month != "All":
+        rows = rows[rows["Month"] == month]
+    totals = pd.DataFrame({
+        "Running Hours": [rows["Running Hours"].sum()],
+        "Downtime": [rows["Downtime"].sum()],
+        "Faults": [rows["Faults"].sum()],
+    })
+    out = add_ratios(totals).iloc[0].to_dict()
+    out["Total Hours"] = rows["Total Hours"].max() if rows["Total Hours"].notna().any() else 0
+    return out
+
+
+def trend(cube, machine, key="Compressor"):
+    return cube[cube[key] == machine].sort_values("Month")
+
+
+def month_slice(cube, month):
+    return cube[cube["Month"] == month]
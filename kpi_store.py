@@ -0,0 +1,229 @@
+"""Materialized monthly KPI table, updated incrementally.
+
+The machine x month cube from kpi.kpi_cube is persisted next to the
+workbook (<stem>.kpi.parquet + <stem>.kpi.json) together with the number of
+table rows already folded in, a fingerprint of the last folded row and the
+last Total Hours reading per machine. New rows (the table is append-only)
+are diffed against those last readings and added to the (machine, month)
+cells they touch, so the cost follows the number of new rows. A table that
+was rewritten underneath (fingerprint mismatch) or a back-dated reading
+triggers a full rebuild.
+
+The state also records the workbook's own mtime/size and a sum of per-row
+hashes of the folded rows. When the workbook changes (a compaction, or a
+hand edit in Excel) the sum is recomputed: a compaction leaves it as it
+was, an edit anywhere in the folded rows does not and forces a rebuild.
+"""
+import contextlib
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+import data_store
+import kpi
+import profiling
+from locking import atomic_output
+
+SUM_COLUMNS = ["Running Hours", "Downtime", "Faults"]
+BASE_COLUMNS = SUM_COLUMNS + ["Total Hours"]
+FINGERPRINT_COLUMNS = ["Date", "Total Hours", kpi.DOWNTIME_COL, kpi.FAULTS_COL]
+
+_lock = threading.Lock()
+_states = {}
+_stats = {"full": 0, "incremental": 0, "rows_folded": 0}
+
+
+def _paths(path):
+    stem = os.path.splitext(path)[0]
+    return stem + ".kpi.parquet", stem + ".kpi.json"
+
+
+def _fingerprint(df, i, key="Compressor"):
+    if i < 0:
+        return ""
+    row = df.iloc[i]
+    parts = [str(row[c]) if c in df.columns else "" for c in [key] + FINGERPRINT_COLUMNS]
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def _row_sum(df, key, start=0, stop=None):
+    return data_store.row_hash_sum(df, [key] + FINGERPRINT_COLUMNS, start, stop)
+
+
+def _readings(df, key):
+    readings = df.loc[df["Total Hours"].notna() & df[key].notna(), [key, "Date", "Total Hours"]]
+    return readings.assign(**{key: readings[key].astype(str)}).dropna(subset=["Date"])
+
+
+def _last_readings(df, key="Compressor"):
+    readings = _readings(df, key).sort_values([key, "Date"], kind="stable")
+    return readings.groupby(key).tail(1).set_index(key)[["Date", "Total Hours"]]
+
+
+def _full_state(df, key="Compressor"):
+    cube = kpi.monthly_sums(df, kpi.running_hours(df, key), key)
+    return {
+        "cube": cube,
+        "last": _last_readings(df, key),
+        "rows_seen": len(df),
+        "tail": _fingerprint(df, len(df) - 1, key),
+        "row_sum": _row_sum(df, key),
+    }
+
+
+def _fold(state, df, key="Compressor"):
+    """Fold df.iloc[rows_seen:] into state in place. False if a rebuild is needed."""
+    new = df.iloc[state["rows_seen"]:]
+    if new.empty:
+        return True
+    last = state["last"]
+
+    readings = _readings(new, key)
+    seeds = last[last.index.isin(readings[key].unique())]
+    # No seeds (first readings of a machine, or new rows without Total Hours)
+    # means nothing can be back-dated.
+    if not seeds.empty:
+        prev_date = pd.to_datetime(seeds["Date"]).reindex(readings[key].to_numpy())
+        if (readings["Date"].to_numpy() < prev_date.to_numpy()).any():
+            return False  # back-dated reading: later diffs change too
+
+    # Seeds get negative labels so they never collide with the table's row labels.
+    seed_frame = seeds.rename_axis(key).reset_index().set_axis(-1 - np.arange(len(seeds)))
+    seq = pd.concat([seed_frame, readings]).sort_values([key, "Date"], kind="stable")
+    diffs = seq.groupby(key)["Total Hours"].diff()
+    running = diffs[diffs.index >= 0].reindex(new.index).fillna(0.0)
+
+    partial = kpi.monthly_sums(new, running, key)
+    cube = state["cube"]
+    existing = partial.index.intersection(cube.index)
+    if len(existing):
+        cube.loc[existing, SUM_COLUMNS] += partial.loc[existing, SUM_COLUMNS]
+        cube.loc[existing, "Total Hours"] = np.fmax(cube.loc[existing, "Total Hours"],
+                                                    partial.loc[existing, "Total Hours"])
+    added = partial.index.difference(cube.index)
+    if len(added):
+        cube = pd.concat([cube, partial.loc[added]]).sort_index()
+    state["cube"] = cube
+
+    if not readings.empty:
+        latest = readings.groupby(key).tail(1).set_index(key)[["Date", "Total Hours"]]
+        state["last"] = pd.concat([last[~last.index.isin(latest.index)], latest]).sort_index()
+    state["row_sum"] = (state["row_sum"] + _row_sum(df, key, state["rows_seen"])) % 2 ** 64
+    state["rows_seen"] = len(df)
+    state["tail"] = _fingerprint(df, len(df) - 1, key)
+    return True
+
+
+def _save(path, state):
+    if not data_store.HAS_PYARROW:
+        return
+    cube_path, meta_path = _paths(path)
+    with atomic_output(cube_path) as tmp:
+        state["cube"].reset_index().to_parquet(tmp, index=False)
+    meta = {
+        "rows_seen": state["rows_seen"],
+        "tail": state["tail"],
+        "row_sum": str(state["row_sum"]),
+        "base": state["base"],
+        "last": {c: [d.isoformat(), float(h)] for c, (d, h) in state["last"].iterrows()},
+    }
+    with atomic_output(meta_path) as tmp:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+
+def _load(path, key="Compressor"):
+    cube_path, meta_path = _paths(path)
+    if not data_store.HAS_PYARROW or not os.path.exists(cube_path):
+        return None
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        cube = pd.read_parquet(cube_path).set_index([key, "Month"])
+        last = pd.DataFrame.from_dict(meta["last"], orient="index", columns=["Date", "Total Hours"])
+        state = {"cube": cube[BASE_COLUMNS], "last": last, "rows_seen": meta["rows_seen"], "tail": meta["tail"],
+                 "row_sum": int(meta["row_sum"]), "base": meta["base"]}
+    except KeyError:
+        return None  # saved under another key column
+    except (OSError, ValueError):
+        return None
+    last["Date"] = pd.to_datetime(last["Date"])
+    last.index.name = key
+    return state
+
+
+def _view(state):
+    return kpi.add_ratios(state["cube"].reset_index())
+
+
+def materialized_cube(path=data_store.COMPRESSOR_HOURS_FILE, key="Compressor", load=data_store.read_table):
+    """The kpi.kpi_cube frame for the table at path, folding in only new rows.
+
+    load(path) returns the table; key names its machine column.
+    """
+    base = data_store.base_version(path)  # before the table: an edit in between is seen next time
+    base = None if base is None else list(base)
+    df = load(path)
+    target = os.path.abspath(path)
+    with profiling.span(f"kpi cube {os.path.basename(path)}", rows=len(df)), _lock:
+        state = _states.get(target) or _load(path, key)
+        if state is not None and state["base"] != base:
+            # The workbook itself was rewritten: by a compaction (same rows)
+            # or by hand (possibly any row).
+            if state["rows_seen"] > len(df) or _row_sum(df, key, 0, state["rows_seen"]) != state["row_sum"]:
+                state = None
+            else:
+                state["base"] = base
+                _save(path, state)
+        if state is not None and state["rows_seen"] == len(df) and state["tail"] == _fingerprint(df, len(df) - 1, key):
+            if "view" not in state:
+                state["view"] = _view(state)
+            _states[target] = state
+            return state["view"]
+
+        valid = (state is not None and state["rows_seen"] <= len(df)
+                 and state["tail"] == _fingerprint(df, state["rows_seen"] - 1, key))
+        if valid:
+            rows = len(df) - state["rows_seen"]
+            valid = _fold(state, df, key)
+        if valid:
+            _stats["incremental"] += 1
+            _stats["rows_folded"] += rows
+        else:
+            state = _full_state(df, key)
+            _stats["full"] += 1
+        state["base"] = base
+        state["view"] = _view(state)
+        _states[target] = state
+        _save(path, state)
+        return state["view"]
+
+
+def last_readings(path=data_store.COMPRESSOR_HOURS_FILE, key="Compressor", load=data_store.read_table):
+    """Last (Date, Total Hours) per machine, indexed by machine name.
+
+    Kept current by the same incremental fold as the cube.
+    """
+    materialized_cube(path, key, load)
+    with _lock:
+        return _states[os.path.abspath(path)]["last"]
+
+
+def reset():
+    """Forget every materialized cube, in memory and on disk."""
+    with _lock:
+        targets = list(_states)
+        _states.clear()
+    for target in targets:
+        for p in _paths(target):
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(p)
+
+
+def stats():
+    with _lock:
+        return dict(_stats)
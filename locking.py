@@ -0,0 +1,205 @@
+"""Cross-process write serialization for the shared workbooks.
+
+Several shift PCs run the dashboard against the same network folder, so the
+lock is a lock *file* created with O_EXCL (works on SMB shares and Windows,
+unlike fcntl). Waiters retry with exponential backoff. The holder writes a
+unique owner token into the file and refreshes its mtime every
+STALE_AFTER / 4 seconds. A waiter never compares that mtime with its own
+clock (the file server sets it, and PC clocks drift): it remembers the
+(token, mtime) it sees and when, on its local time.monotonic(), and only a
+lock that stays exactly the same for STALE_AFTER belongs to a crashed writer.
+Breaking happens under a second lock file (<lock>.break), so one waiter at a
+time re-checks the lock and removes it; release removes the file only while
+it still holds the owner's token.
+"""
+import contextlib
+import os
+import random
+import socket
+import tempfile
+import threading
+import time
+import uuid
+
+STALE_AFTER = 30.0
+# Longer than STALE_AFTER, so one waiter can see a crashed writer's lock go stale.
+DEFAULT_TIMEOUT = 45.0
+INITIAL_BACKOFF = 0.01
+MAX_BACKOFF = 0.5
+
+
+class LockTimeout(TimeoutError):
+    pass
+
+
+_stats_lock = threading.Lock()
+_stats = {}
+
+
+def _record(path, waited, contended, timed_out=False):
+    with _stats_lock:
+        s = _stats.setdefault(os.path.basename(path), {
+            "acquired": 0, "contended": 0, "timeouts": 0,
+            "total_wait_s": 0.0, "max_wait_s": 0.0,
+        })
+        if timed_out:
+            s["timeouts"] += 1
+        else:
+            s["acquired"] += 1
+        if contended:
+            s["contended"] += 1
+        s["total_wait_s"] += waited
+        s["max_wait_s"] = max(s["max_wait_s"], waited)
+
+
+def lock_stats():
+    """Per-file lock metrics: acquisitions, contended waits, timeouts and wait time."""
+    with _stats_lock:
+        return {name: dict(s) for name, s in _stats.items()}
+
+
+def lock_path(path):
+    return path + ".lock"
+
+
+def _owner(lpath):
+    try:
+        with open(lpath, encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _state(lpath):
+    """(owner token, mtime_ns) of the lock file; None if there is none."""
+    try:
+        mtime = os.stat(lpath).st_mtime_ns
+    except OSError:
+        return None
+    return _owner(lpath), mtime
+
+
+_watch_lock = threading.Lock()
+_watched = {}  # lock path -> (state, time.monotonic() it was first seen), shared by this process's waiters
+
+
+def _unchanged_for(lpath, state):
+    """Seconds this process has seen lpath in exactly this state."""
+    now = time.monotonic()
+    with _watch_lock:
+        seen = _watched.get(lpath)
+        if seen is None or seen[0] != state:
+            _watched[lpath] = (state, now)
+            return 0.0
+        return now - seen[1]
+
+
+def _remove_if(lpath, state):
+    with contextlib.suppress(FileNotFoundError):
+        if _state(lpath) == state:
+            os.remove(lpath)
+    with _watch_lock:
+        _watched.pop(lpath, None)
+
+
+def _break_if_stale(lpath):
+    state = _state(lpath)
+    if state is None or _unchanged_for(lpath, state) < STALE_AFTER:
+        return
+    bpath = lpath + ".break"
+    try:
+        fd = os.open(bpath, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        # Another waiter is breaking it. A breaker that crashed leaves its own
+        # file unchanged; that one is removed directly (breakers hold it for
+        # milliseconds, so two waiters racing here is a crash on top of a crash).
+        bstate = _state(bpath)
+        if bstate is not None and _unchanged_for(bpath, bstate) >= STALE_AFTER:
+            _remove_if(bpath, bstate)
+        return
+    except OSError:
+        return
+    try:
+        os.close(fd)
+        _remove_if(lpath, state)  # only if nobody refreshed or re-took it since
+    finally:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(bpath)
+
+
+def _heartbeat(lpath, token, stop):
+    while not stop.wait(STALE_AFTER / 4):
+        if _owner(lpath) != token:
+            return  # the lock was taken from us; nothing left to refresh
+        with contextlib.suppress(OSError):
+            os.utime(lpath)
+
+
+@contextlib.contextmanager
+def file_lock(path, timeout=DEFAULT_TIMEOUT):
+    """Hold the exclusive writer lock for path (the workbook, not the lock file)."""
+    lpath = lock_path(path)
+    start = time.perf_counter()
+    backoff = INITIAL_BACKOFF
+    contended = False
+    while True:
+        try:
+            fd = os.open(lpath, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            contended = True
+            waited = time.perf_counter() - start
+            if waited >= timeout:
+                _record(path, waited, contended, timed_out=True)
+                raise LockTimeout(f"Timed out after {waited:.1f}s waiting for {lpath}")
+            _break_if_stale(lpath)
+            time.sleep(backoff * (0.5 + random.random()))
+            backoff = min(backoff * 2, MAX_BACKOFF)
+    _record(path, time.perf_counter() - start, contended)
+    token = f"{socket.gethostname()} {os.getpid()} {uuid.uuid4().hex}\n"
+    stop = threading.Event()
+    beat = None
+    try:
+        os.write(fd, token.encode())
+        os.close(fd)
+        beat = threading.Thread(target=_heartbeat, args=(lpath, token, stop),
+                                name=f"lock:{os.path.basename(path)}", daemon=True)
+        beat.start()
+        yield
+    finally:
+        stop.set()
+        if beat is not None:
+            beat.join()
+        if _owner(lpath) == token:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(lpath)
+
+
+def _replace_with_retry(src, dst, attempts=5):
+    # On Windows the rename fails while Excel or a reader has dst open.
+    backoff = INITIAL_BACKOFF
+    for attempt in range(attempts):
+        try:
+            os.replace(src, dst)
+            return
+        except PermissionError:
+            if attempt == attempts - 1:
+                raise
+            time.sleep(backoff)
+            backoff = min(backoff * 4, MAX_BACKOFF)
+
+
+@contextlib.contextmanager
+def atomic_output(path):
+    """Yield a temp path in the target's folder; rename it over path on success."""
+    folder = os.path.dirname(os.path.abspath(path))
+    base, ext = os.path.splitext(os.path.basename(path))
+    fd, tmp = tempfile.mkstemp(prefix=f".{base}.", suffix=ext, dir=folder)
+    os.close(fd)
+    try:
+        yield tmp
+        _replace_with_retry(tmp, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp)
+        raise
@@ -0,0 +1,70 @@
+"""Date-sorted, machine-partitioned view of the maintenance log.
+
+A machine + date-range query is two binary searches and a slice, and the
+display copy (Date as a plain date) is prepared once per log version
+instead of on every rerun.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+import profiling
+
+DISPLAY_COLUMNS = ["Date", "Machine", "Time (min)", "Event", "Spare Parts"]
+
+
+class LogIndex:
+    def __init__(self, log_df, columns=DISPLAY_COLUMNS):
+        dates = log_df["Date"]
+        keep = dates.notna()
+        order = np.argsort(dates[keep].to_numpy(), kind="stable")
+        frame = log_df.loc[keep, [c for c in columns if c in log_df.columns]].iloc[order]
+        self._dates = dates[keep].to_numpy()[order]
+        # Row labels of the original log, so callers can map results back.
+        self.labels = frame.index.to_numpy()
+        frame = frame.assign(Date=pd.Series(self._dates, index=frame.index).dt.date)
+        self.frame = frame.reset_index(drop=True)
+
+        machines = self.frame["Machine"].astype(str).to_numpy()
+        self._parts = {}
+        if len(machines):
+            by_machine = np.argsort(machines, kind="stable")
+            names, starts = np.unique(machines[by_machine], return_index=True)
+            bounds = list(starts[1:]) + [len(by_machine)]
+            for name, lo, hi in zip(names, starts, bounds):
+                rows = by_machine[lo:hi]
+                self._parts[name] = (rows, self._dates[rows])
+
+    def __len__(self):
+        return len(self.frame)
+
+    def date_bounds(self):
+        if not len(self._dates):
+            return None, None
+        return pd.Timestamp(self._dates[0]).date(), pd.Timestamp(self._dates[-1]).date()
+
+    def positions(self, machine=None, start=None, end=None):
+        """Positions into self.frame matching the machine and the inclusive date range."""
+        if machine is None:
+            rows, dates = None, self._dates
+        elif machine in self._parts:
+            rows, dates = self._parts[machine]
+        else:
+            return np.empty(0, dtype=np.intp)
+        lo = 0 if start is None else np.searchsorted(dates, np.datetime64(pd.Timestamp(start)), side="left")
+        hi = len(dates) if end is None else np.searchsorted(dates, np.datetime64(pd.Timestamp(end)), side="right")
+        return np.arange(lo, hi) if rows is None else rows[lo:hi]
+
+    def query(self, machine=None, start=None, end=None):
+        with profiling.span("filter log") as s:
+            result = self.frame.iloc[self.positions(machine, start, end)]
+            s.rows = len(result)
+        return result
+
+
+def paginate(df, page, page_size):
+    """Return (rows of the 1-based page, number of pages)."""
+    pages = max(math.ceil(len(df) / page_size), 1)
+    page = min(max(page, 1), pages)
+    return df.iloc[(page - 1) * page_size: page * page_size], pages
@@ -6,7 +6,7 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[('*.xlsx', '.')],
-    hiddenimports=[],
+    hiddenimports=['tabs.compressors', 'tabs.maintenance_log', 'tabs.spare_parts', 'tabs.kpis'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -0,0 +1,77 @@
+"""Remaining hours to next maintenance, for the whole fleet in one pass."""
+import numpy as np
+import pandas as pd
+
+DEFAULT_INTERVALS = (5000, 10000, 40000)
+HOURS_PER_MONTH = 360
+WARN_MONTHS = 6
+
+
+def interval_hours(maint_type):
+    return pd.to_numeric(maint_type.astype(str).str.rstrip("hH"), errors="coerce")
+
+
+def remaining_to_next_maintenance(df, intervals=DEFAULT_INTERVALS, machines=None,
+                                  hours_per_month=HOURS_PER_MONTH, key="Compressor"):
+    """Return one typed row per machine (the key column).
+
+    Columns are "Current Total Hours" and, for every interval, "Next {mt}h At",
+    "Remaining to {mt}h" and "Months to {mt}h" (float, NaN when the machine
+    has no record of that maintenance). hours_per_month is a scalar or a
+    Series indexed by machine. machines, if given, selects and orders rows.
+    """
+    intervals = list(intervals)
+    readings = df.loc[df["Total Hours"].notna(), [key, "Total Hours"]]
+    current = readings.groupby(key, observed=True)["Total Hours"].max()
+    current.index = current.index.astype(str)
+    if machines is not None:
+        current = current.reindex(machines).dropna()
+
+    df = df.reindex(columns=list(df.columns) + [c for c in ("Maintenance Type", "Hours at Maintenance")
+                                                 if c not in df.columns])
+    maint = df.loc[df["Maintenance Type"].notna() & df["Hours at Maintenance"].notna(),
+                   [key, "Date", "Maintenance Type", "Hours at Maintenance"]]
+    maint = maint.assign(**{key: maint[key].astype(str)})
+    maint = maint.assign(Interval=interval_hours(maint["Maintenance Type"]))
+    maint = maint[maint["Interval"].isin(intervals)]
+    last = (maint.sort_values("Date", kind="stable")
+                 .drop_duplicates([key, "Interval"], keep="last"))
+    last_hours = (last.pivot(index=key, columns="Interval", values="Hours at Maintenance")
+                      .reindex(index=current.index, columns=intervals)
+                      .astype("float64"))
+
+    next_due = last_hours + np.asarray(intervals, dtype="float64")
+    remaining = next_due.sub(current, axis=0)
+    if isinstance(hours_per_month, pd.Series):
+        rate = hours_per_month.reindex(current.index).where(lambda r: r > 0)
+        months = remaining.div(rate, axis=0)
+    else:
+        months = remaining / hours_per_month
+
+    result = pd.DataFrame({key: current.index.astype(str),
+                           "Current Total Hours": current.to_numpy(dtype="float64")})
+    for mt in intervals:
+        result[f"Next {mt}h At"] = next_due[mt].to_numpy()
+        result[f"Remaining to {mt}h"] = remaining[mt].to_numpy()
+        result[f"Months to {mt}h"] = months[mt].to_numpy()
+    return result
+
+
+def order_warnings(result, intervals=DEFAULT_INTERVALS, warn_months=WARN_MONTHS):
+    """Intervals for which at least one machine is due within warn_months."""
+    return [mt for mt in intervals
+            if result[f"Months to {mt}h"].between(0, warn_months, inclusive="neither").any()]
+
+
+def format_remaining(result, intervals=DEFAULT_INTERVALS, key="Compressor"):
+    """Display/PDF version of the result: "-" for missing, "1234 (3.4 mo)" for remaining."""
+    out = result[[key, "Current Total Hours"]].copy()
+    for mt in intervals:
+        next_due = result[f"Next {mt}h At"]
+        remaining = result[f"Remaining to {mt}h"]
+        months = result[f"Months to {mt}h"]
+        months_text = months.map("{:.1f}".format).where(months.notna(), "-")
+        text = remaining.map("{:.0f}".format) + " (" + months_text + " mo)"
+        out[f"Next {mt}h At"] = next_due.map("{:.0f}".format).where(next_due.notna(), "-")
+        out[f"Remaining to {mt}h"] = text.where(remaining.notna(), "-")
+    return out
@@ -0,0 +1,212 @@
+"""Timing spans for one dashboard rerun.
+
+    with profiling.span("load " + path) as s:
+        df = ...
+        s.rows = len(df)
+
+Recording is per thread (each Streamlit session reruns in its own script
+thread) and only between start() and finish(). Outside of that, span()
+returns one shared no-op context manager, so instrumented code pays an
+attribute lookup and nothing else. finish() returns the spans and appends
+them as one JSON line to a rotating log (PROFILE_LOG, 1 MB x 3 files).
+DASHBOARD_PROFILE=1 turns the debug sidebar (and so recording) on by default.
+
+Memory deltas come from /proc/self/statm on Linux and from psutil where it
+is installed (the Windows plant PCs). Without either, tracemalloc runs while
+something is recording and the delta counts Python allocations only.
+
+Work that Streamlit runs after the rerun on one of its own threads
+(st.download_button data callables) is wrapped with deferred(); its spans
+are reported by the next finish() of the same session.
+"""
+import collections
+import json
+import logging
+import logging.handlers
+import os
+import threading
+import time
+import tracemalloc
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+ENV_ENABLED = os.environ.get("DASHBOARD_PROFILE", "") not in ("", "0")
+PROFILE_LOG = os.environ.get("DASHBOARD_PROFILE_LOG", "dashboard_profile.log")
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUPS = 3
+MAX_DEFERRED = 50
+
+
+class _State(threading.local):
+    # Class-level defaults keep span() a plain attribute read; getattr with a
+    # default on a bare threading.local costs an exception per call.
+    spans = None
+    depth = 0
+    session = None
+
+
+_local = _State()
+_logger = None
+_logger_lock = threading.Lock()
+_deferred = {}
+_deferred_lock = threading.Lock()
+
+_HAS_STATM = os.path.exists("/proc/self/statm")
+_process = psutil.Process() if psutil is not None and not _HAS_STATM else None
+_USE_TRACEMALLOC = not _HAS_STATM and _process is None
+_tracers = 0
+
+
+def _rss_bytes():
+    if _HAS_STATM:
+        try:
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError):
+            return None
+    if _process is not None:
+        return _process.memory_info().rss
+    if tracemalloc.is_tracing():
+        return tracemalloc.get_traced_memory()[0]
+    return None
+
+
+def _trace(delta):
+    # tracemalloc slows every allocation, so it only runs while some thread records.
+    global _tracers
+    if not _USE_TRACEMALLOC:
+        return
+    with _deferred_lock:
+        _tracers += delta
+        if _tracers > 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        elif _tracers == 0 and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+
+class _NullSpan:
+    rows = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, name, value):
+        pass  # "s.rows = ..." on a disabled span is a no-op
+
+
+_NULL = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("record", "rows", "_start", "_rss")
+
+    def __init__(self, name, depth, rows):
+        self.rows = rows
+        self.record = {"name": name, "depth": depth}
+
+    def __enter__(self):
+        _local.depth += 1
+        self._rss = _rss_bytes()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        self.record["ms"] = (time.perf_counter() - self._start) * 1000
+        _local.depth -= 1
+        rss = _rss_bytes()
+        self.record["mem_mb"] = None if rss is None or self._rss is None else (rss - self._rss) / 2 ** 20
+        self.record["rows"] = self.rows
+        if exc_type is not None:
+            self.record["error"] = exc_type.__name__
+        return False
+
+
+def active():
+    return _local.spans is not None
+
+
+def start(session=None):
+    """Begin recording spans for this thread's rerun.
+
+    session identifies the browser session, for the spans deferred() records.
+    """
+    if _local.spans is None:
+        _trace(+1)
+    _local.spans = []
+    _local.depth = 0
+    _local.session = session
+    _local.started = time.perf_counter()
+
+
+def span(name, rows=None):
+    spans = _local.spans
+    if spans is None:
+        return _NULL
+    s = _Span(name, _local.depth, rows)
+    spans.append(s.record)  # appended on entry so nested spans list under their parent
+    return s
+
+
+def finish(label="", log=True):
+    """Stop recording; return {"label", "total_ms", "spans"} (None if not recording)."""
+    spans = _local.spans
+    if spans is None:
+        return None
+    result = {"label": label, "total_ms": (time.perf_counter() - _local.started) * 1000,
+              "spans": [s for s in spans if "ms" in s]}
+    _local.spans = None
+    _trace(-1)
+    if _local.session is not None:
+        with _deferred_lock:
+            result["spans"] += _deferred.pop(_local.session, ())
+    if log:
+        _log(result)
+    return result
+
+
+def deferred(fn, name, rows=None):
+    """fn wrapped so a call on another thread, after this rerun, is recorded as
+    a span (flagged "deferred") and reported by the session's next finish().
+
+    Returns fn itself when this thread is not recording with a session.
+    """
+    session = _local.session if _local.spans is not None else None
+    if session is None:
+        return fn
+
+    def run(*args, **kwargs):
+        start()
+        try:
+            with span(name, rows):
+                return fn(*args, **kwargs)
+        finally:
+            spans = finish(log=False)["spans"]
+            for s in spans:
+                s["deferred"] = True
+            with _deferred_lock:
+                _deferred.setdefault(session, collections.deque(maxlen=MAX_DEFERRED)).extend(spans)
+
+    return run
+
+
+def _log(result):
+    global _logger
+    with _logger_lock:
+        if _logger is None:
+            handler = logging.handlers.RotatingFileHandler(PROFILE_LOG, maxBytes=LOG_MAX_BYTES,
+                                                           backupCount=LOG_BACKUPS, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            _logger = logging.getLogger("dashboard.profile")
+            _logger.propagate = False
+            _logger.setLevel(logging.INFO)
+            _logger.addHandler(handler)
+    try:
+        _logger.info(json.dumps({"time": time.strftime("%Y-%m-%dT%H:%M:%S"), **result}, default=str))
+    except OSError:
+        pass  # a read-only folder must not break the dashboard
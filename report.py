@@ -0,0 +1,229 @@
+"""PDF rendering for the dashboard tables.
+
+Cells are converted to strings once per column, rows are emitted with
+itertuples, long tables are paginated with the header repeated on every
+page, and the PDF is returned as bytes (no temp files).
+
+cached_render_pdf keys rendered bytes on a hash of the frame contents and
+the title, held in a size-bounded LRU that can spill evicted reports to disk.
+The spill folder is bounded too: past SPILL_MAX_BYTES the least recently
+used files are deleted.
+"""
+import collections
+import contextlib
+import functools
+import hashlib
+import os
+import threading
+
+import pandas as pd
+
+import profiling
+from locking import atomic_output
+
+PAGE_WIDTH = 297
+PAGE_HEIGHT = 210
+MARGIN = 10
+ROW_HEIGHT = 8
+TITLE_HEIGHT = 15
+MM_PER_CHAR = 2.5
+
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+SPILL_MAX_BYTES = 256 * 1024 * 1024
+
+
+class _Chunks:
+    """Stand-in for FPDF.buffer: fpdf 1.7 grows the finished document with
+    `self.buffer += line`, which copies the whole document on every line and
+    makes long reports quadratic. Collecting the lines keeps it linear."""
+
+    def __init__(self):
+        self.parts = []
+        self.length = 0
+
+    def __iadd__(self, text):
+        self.parts.append(text)
+        self.length += len(text)
+        return self
+
+    def __len__(self):
+        return self.length
+
+
+def _string_columns(df):
+    # fpdf's core fonts are latin-1 only; replace anything else instead of failing.
+    strs = df.astype(str).where(df.notna(), "")
+    return strs.apply(lambda s: s.str.encode("latin-1", "replace").str.decode("latin-1"))
+
+
+def _column_widths(strs):
+    chars = [max(len(str(col)), int(strs[col].str.len().max() or 0)) for col in strs.columns]
+    widths = [max(c, 1) * MM_PER_CHAR for c in chars]
+    usable = PAGE_WIDTH - 2 * MARGIN
+    total = sum(widths)
+    if total > usable:
+        widths = [w * usable / total for w in widths]
+    return widths
+
+
+def render_pdf(df, title="Report"):
+    """Render df as a landscape A4 table and return the PDF bytes."""
+    strs = _string_columns(df)
+    widths = _column_widths(strs)
+    max_chars = [max(int(w / MM_PER_CHAR), 1) for w in widths]
+    strs = pd.DataFrame({col: strs[col].str.slice(0, n) for col, n in zip(strs.columns, max_chars)})
+    header = [str(col)[:n] for col, n in zip(strs.columns, max_chars)]
+
+    from fpdf import FPDF  # deferred: only needed when a PDF is actually rendered
+
+    pdf = FPDF(orientation="L", unit="mm", format="A4")
+    chunked = getattr(pdf, "buffer", None) == ""
+    if chunked:
+        pdf.buffer = _Chunks()
+    pdf.set_auto_page_break(False)
+    pdf.set_margins(MARGIN, MARGIN)
+    pdf.set_font("Arial", size=12)
+    rows_first = int((PAGE_HEIGHT - 2 * MARGIN - TITLE_HEIGHT) // ROW_HEIGHT) - 1
+    rows_other = int((PAGE_HEIGHT - 2 * MARGIN) // ROW_HEIGHT) - 1
+
+    def new_page(with_title):
+        pdf.add_page()
+        if with_title:
+            pdf.cell(0, 10, txt=title, ln=1, align="C")
+            pdf.ln(5)
+        for w, text in zip(widths, header):
+            pdf.cell(w, ROW_HEIGHT, text, border=1, align="C")
+        pdf.ln(ROW_HEIGHT)
+
+    new_page(with_title=True)
+    left = rows_first
+    for row in strs.itertuples(index=False, name=None):
+        if left == 0:
+            new_page(with_title=False)
+            left = rows_other
+        for w, text in zip(widths, row):
+            pdf.cell(w, ROW_HEIGHT, text, border=1, align="C")
+        pdf.ln(ROW_HEIGHT)
+        left -= 1
+
+    if chunked:
+        pdf.close()
+        return "".join(pdf.buffer.parts).encode("latin-1")
+    out = pdf.output(dest="S")
+    return out.encode("latin-1") if isinstance(out, str) else bytes(out)
+
+
+def content_hash(df, title):
+    h = hashlib.sha1()
+    h.update(title.encode("utf-8"))
+    h.update(repr([str(c) for c in df.columns]).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+class ReportCache:
+    """LRU of rendered PDFs bounded by total bytes, optionally spilling to disk."""
+
+    def __init__(self, max_bytes=CACHE_MAX_BYTES, spill_dir=None, spill_max_bytes=SPILL_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self.spill_max_bytes = spill_max_bytes
+        self._entries = collections.OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "spill_evictions": 0}
+
+    def _spill_path(self, key):
+        return os.path.join(self.spill_dir, key + ".pdf")
+
+    def _spill(self, key, data):
+        # Best effort: a full or read-only disk costs a re-render, not the download.
+        try:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            with atomic_output(self._spill_path(key)) as tmp:
+                with open(tmp, "wb") as f:
+                    f.write(data)
+            self._trim_spill()
+        except OSError:
+            pass
+
+    def _trim_spill(self):
+        """Delete the least recently used spill files until the folder fits spill_max_bytes.
+
+        Other processes may share the folder, so it is measured from disk."""
+        files = []
+        for entry in os.scandir(self.spill_dir):
+            if entry.name.endswith(".pdf") and not entry.name.startswith("."):  # skip atomic_output temps
+                with contextlib.suppress(FileNotFoundError):
+                    st = entry.stat()
+                    files.append((st.st_mtime_ns, st.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.spill_max_bytes:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+                self._stats["spill_evictions"] += 1
+            total -= size
+
+    def _put(self, key, data):
+        self._entries[key] = data
+        self._bytes += len(data)
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            old_key, old = self._entries.popitem(last=False)
+            self._bytes -= len(old)
+            self._stats["evictions"] += 1
+            if self.spill_dir:
+                self._spill(old_key, old)
+
+    def get_or_render(self, df, title):
+        key = content_hash(df, title)
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return data
+            if self.spill_dir:
+                try:
+                    with open(self._spill_path(key), "rb") as f:
+                        data = f.read()
+                    os.utime(self._spill_path(key))  # recently used: trimmed last
+                except OSError:
+                    data = None
+            if data is not None:
+                self._stats["disk_hits"] += 1
+                self._put(key, data)
+                return data
+        data = render_pdf(df, title)
+        with self._lock:
+            self._stats["misses"] += 1
+            if key not in self._entries:
+                self._put(key, data)
+        return data
+
+    def stats(self):
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["disk_hits"] + self._stats["misses"]
+            hit_rate = (self._stats["hits"] + self._stats["disk_hits"]) / lookups if lookups else 0.0
+            return dict(self._stats, entries=len(self._entries), bytes_held=self._bytes,
+                        hit_rate=hit_rate)
+
+
+_cache = ReportCache(spill_dir=os.environ.get("REPORT_CACHE_DIR"))
+
+
+def cached_render_pdf(df, title="Report"):
+    """render_pdf, but repeat requests for unchanged data cost a hash lookup."""
+    with profiling.span(f"pdf {title}", rows=len(df)):
+        return _cache.get_or_render(df, title)
+
+
+def pdf_download(df, title="Report"):
+    """data= callable for st.download_button. Streamlit renders it on click, on
+    its own thread after the rerun, so it is timed with profiling.deferred."""
+    return profiling.deferred(functools.partial(cached_render_pdf, df, title), f"download {title}", rows=len(df))
+
+
+def cache_stats():
+    return _cache.stats()
@@ -0,0 +1,192 @@
+"""Column dtypes every plant table is normalized to once, on load.
+
+    python schema.py [workbook ...]
+
+Equipment names are categoricals over MACHINE_LIST (names outside the list
+are kept, appended after it, and reported by validate()), dates are
+datetime64, hours float32 and fault counts nullable Int16. Downstream code
+filters and groups these frames as they are instead of re-coercing them.
+Free-text columns keep pandas' own string dtype. float32 stays in memory and
+in the Parquet sidecars; for_export() widens hours back for the xlsx.
+
+The command line validates each workbook (data_store.WORKBOOKS by default)
+against the schema and prints its memory as read by pandas and after apply().
+"""
+import sys
+
+import pandas as pd
+
+MACHINE_LIST = [
+    "Sabroe VMY336B (1)", "Sabroe VMY336B (2)",
+    "Howden MK6D (5)", "Howden MK6D (6)",
+    "Sabroe SGC 1918 (7)", "Sabroe SGC 1918 (9)", "Sabroe SGC 1918 (10)",
+    "Sabroe SGC 2813 (11)", "Sabroe SGC 2813 (12)",
+    "Howden MK6D (13)", "Howden MK6D (14)", "Howden MK6D (15)", "Howden MK6D (16)",
+    "Cooling Tower (1)", "Cooling Tower (2)", "Cooling Tower (3)",
+    "Cooling Tower (4)", "Cooling Tower (5)", "Cooling Tower (6)"
+]
+
+DATE = "date"
+MONTH = "month"
+MACHINE = "machine"
+CATEGORY = "category"
+HOURS = "float32"
+COUNT = "Int16"
+try:
+    TEXT = pd.StringDtype(na_value=float("nan"))  # pandas' default "str" dtype
+except TypeError:
+    TEXT = "object"  # pandas < 2.3
+
+# Shared by all workbooks; a column a workbook does not have is skipped.
+# "Month" is the date column of the cooling tower sheet but a numeric leftover
+# in the compressor sheet: MONTH types it as a date unless it already holds numbers.
+COLUMNS = {
+    "Date": DATE,
+    "Month": MONTH,
+    "Compressor": MACHINE,
+    "Cooling Tower": MACHINE,
+    "Machine": MACHINE,
+    "Maintenance Type": CATEGORY,
+    "Running Hours": HOURS,
+    "Total Hours": HOURS,
+    "Hours at Maintenance": HOURS,
+    "Maint 5000h": HOURS,
+    "Maint 10000h": HOURS,
+    "Maint 40000h": HOURS,
+    "DOWN TIME (HRS)": HOURS,
+    "MTTR": HOURS,
+    "MTBF": HOURS,
+    "AVAILABILITY": HOURS,
+    "Time (min)": HOURS,
+    "NO. OF FAULTS": COUNT,
+}
+
+
+def _names(s):
+    return s.astype(str).str.strip().where(s.notna())
+
+
+def _machines(s):
+    names = _names(s)
+    extra = sorted(set(names.dropna()) - set(MACHINE_LIST))
+    return pd.Categorical(names, categories=MACHINE_LIST + extra)
+
+
+def _count(s):
+    num = pd.to_numeric(s, errors="coerce")
+    whole = num.dropna()
+    if ((whole % 1 == 0) & whole.between(-2 ** 15, 2 ** 15 - 1)).all():
+        return num.astype(COUNT)
+    return num.astype(HOURS)  # fractional or huge counts stay readable; validate() reports them
+
+
+def _is_numbers(s):
+    return pd.api.types.is_numeric_dtype(s.dtype) and s.notna().any()
+
+
+def apply(df):
+    """df with every schema column converted; already-typed columns are not touched."""
+    df = df.copy()
+    for col, kind in COLUMNS.items():
+        if col not in df.columns:
+            continue
+        s = df[col]
+        if kind == MONTH:
+            if _is_numbers(s):
+                continue
+            kind = DATE
+        if kind == DATE:
+            if not pd.api.types.is_datetime64_any_dtype(s.dtype):
+                df[col] = pd.to_datetime(s, errors="coerce")
+        elif kind == MACHINE:
+            if not (isinstance(s.dtype, pd.CategoricalDtype)
+                    and list(s.cat.categories[:len(MACHINE_LIST)]) == MACHINE_LIST):
+                df[col] = _machines(s)
+        elif kind == CATEGORY:
+            if not isinstance(s.dtype, pd.CategoricalDtype):
+                df[col] = _names(s).astype("category")
+        elif kind == COUNT:
+            if s.dtype != COUNT:
+                df[col] = _count(s)
+        elif s.dtype != kind:
+            df[col] = pd.to_numeric(s, errors="coerce").astype(kind)
+    # Free-text columns that Excel left entirely empty come back as float NaN;
+    # type them as text so later string rows append cleanly.
+    for col in df.columns:
+        if col not in COLUMNS and df[col].dtype != TEXT and df[col].isna().all():
+            df[col] = df[col].astype(TEXT)
+    return df
+
+
+def for_export(df):
+    """df with float32 hours widened for the xlsx. Each value becomes the float64
+    of its shortest float32 repr, so 18734.3 is written as 18734.3 and not
+    18734.30078125."""
+    hours = [col for col, kind in COLUMNS.items() if kind == HOURS and col in df.columns and df[col].dtype == HOURS]
+    if not hours:
+        return df
+    return df.assign(**{col: pd.to_numeric(df[col].astype(str), errors="coerce").astype("float64") for col in hours})
+
+
+def validate(df):
+    """Problems that apply() would turn into missing values, as readable strings."""
+    problems = []
+    for col, kind in COLUMNS.items():
+        if col not in df.columns:
+            continue
+        s = df[col]
+        present = s.notna() & (s.astype("object").astype(str).str.strip() != "")
+        if kind == MONTH:
+            if _is_numbers(s):
+                continue
+            kind = DATE
+        if kind == DATE:
+            bad = present & pd.to_datetime(s, errors="coerce").isna()
+            what = "unparseable dates"
+        elif kind == MACHINE:
+            names = _names(s)
+            bad = present & ~names.isin(MACHINE_LIST)
+            what = "names not in the machine list"
+        elif kind == CATEGORY:
+            continue
+        else:
+            num = pd.to_numeric(s, errors="coerce")
+            bad = present & num.isna()
+            what = "non-numeric values"
+            if kind == COUNT:
+                bad |= num.notna() & ((num % 1 != 0) | ~num.between(-2 ** 15, 2 ** 15 - 1))
+                what = "values that are not whole counts"
+        if bad.any():
+            sample = ", ".join(repr(v) for v in pd.unique(s[bad].astype("object"))[:3])
+            problems.append(f"{col}: {int(bad.sum())} {what} ({sample})")
+    return problems
+
+
+def memory_mb(df):
+    return df.memory_usage(deep=True, index=True).sum() / 2 ** 20
+
+
+def report(path, sheet_name="Sheet1"):
+    """{"rows", "raw_mb", "typed_mb", "problems"} for one workbook."""
+    raw = pd.read_excel(path, sheet_name=sheet_name)
+    typed = apply(raw)
+    return {"rows": len(raw), "raw_mb": memory_mb(raw), "typed_mb": memory_mb(typed),
+            "problems": validate(raw)}
+
+
+def check(paths=None):
+    """Print the report for each workbook. Returns the number with problems."""
+    import data_store  # data_store imports this module; the list is only needed by the command
+    failed = 0
+    for path in paths or data_store.WORKBOOKS:
+        r = report(path)
+        print(f"{'⚠️' if r['problems'] else '✅'} {path}: {r['rows']} rows, "
+              f"{r['raw_mb']:.2f} MB as read -> {r['typed_mb']:.2f} MB typed")
+        for problem in r["problems"]:
+            print(f"   {problem}")
+        failed += bool(r["problems"])
+    return failed
+
+
+if __name__ == "__main__":
+    sys.exit(1 if check(sys.argv[1:]) else 0)
@@ -0,0 +1,143 @@
+"""Inverted index over the free-text Event and Spare Parts columns of the log.
+
+Documents are log rows, numbered by their position in data_store's log table
+(which is append-only), so new rows from "Save All Events" are added to the
+existing index instead of rebuilding it. The index is keyed on the workbook's
+base_version: while it is unchanged only journal rows can be new; when it
+changes the indexed rows are rehashed and an edit rebuilds the index. Queries
+match all of their terms and are ranked with BM25, with a bonus when the
+query appears verbatim.
+"""
+import collections
+import math
+import os
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+import data_store
+import profiling
+
+TEXT_COLUMNS = ["Event", "Spare Parts"]
+TOKEN_RE = re.compile(r"[0-9a-z\u0600-\u06ff]+")
+K1 = 1.2
+B = 0.75
+PHRASE_BONUS = 2.0
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+def _texts(df):
+    cols = [c for c in TEXT_COLUMNS if c in df.columns]
+    if not cols:
+        return pd.Series("", index=df.index)
+    text = df[cols[0]].astype(str).where(df[cols[0]].notna(), "")
+    for col in cols[1:]:
+        text = text + " " + df[col].astype(str).where(df[col].notna(), "")
+    return text.str.lower()
+
+
+class SearchIndex:
+    def __init__(self):
+        self.postings = collections.defaultdict(dict)
+        self.texts = []
+        self.doc_len = []
+        self.total_len = 0
+        self.row_sum = 0  # data_store.row_hash_sum of the indexed rows
+        self.base = None
+
+    def __len__(self):
+        return len(self.texts)
+
+    def add(self, df):
+        """Index df's rows as the next documents (ids continue from len(self))."""
+        start = len(self.texts)
+        for doc, text in enumerate(_texts(df), start):
+            tokens = tokenize(text)
+            for term, tf in collections.Counter(tokens).items():
+                self.postings[term][doc] = tf
+            self.texts.append(text)
+            self.doc_len.append(len(tokens))
+            self.total_len += len(tokens)
+        self.row_sum = (self.row_sum + data_store.row_hash_sum(df, TEXT_COLUMNS)) % 2 ** 64
+        return len(df)
+
+    def indexes_prefix_of(self, df, base):
+        """True when df still starts with the indexed rows; base is the
+        workbook's base_version when df was read."""
+        n = len(self.texts)
+        if n > len(df):
+            return False
+        return base == self.base or data_store.row_hash_sum(df, TEXT_COLUMNS, 0, n) == self.row_sum
+
+    def search(self, query, candidates=None, limit=200):
+        """Return [(doc id, score)] best first. candidates restricts the doc ids."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self.texts:
+            return []
+        lists = [self.postings.get(t, {}) for t in terms]
+        if any(not p for p in lists):
+            return []
+        docs = set(min(lists, key=len))
+        for p in lists:
+            docs.intersection_update(p)
+        if candidates is not None:
+            docs.intersection_update(candidates)
+        if not docs:
+            return []
+
+        ids = np.fromiter(docs, dtype=np.int64, count=len(docs))
+        n = len(self.texts)
+        avgdl = self.total_len / n if n else 1.0
+        dl = np.asarray(self.doc_len, dtype="float64")[ids]
+        norm = K1 * (1 - B + B * dl / max(avgdl, 1e-9))
+        scores = np.zeros(len(ids))
+        for p in lists:
+            tf = np.fromiter((p[d] for d in ids), dtype="float64", count=len(ids))
+            idf = math.log(1 + (n - len(p) + 0.5) / (len(p) + 0.5))
+            scores += idf * tf * (K1 + 1) / (tf + norm)
+        phrase = query.strip().lower()
+        if len(terms) > 1:
+            scores += PHRASE_BONUS * np.fromiter((phrase in self.texts[d] for d in ids),
+                                                 dtype="float64", count=len(ids))
+        order = np.argsort(-scores, kind="stable")[:limit]
+        return [(int(ids[i]), float(scores[i])) for i in order]
+
+
+_lock = threading.Lock()
+_indexes = {}
+_stats = {"builds": 0, "incremental_rows": 0}
+
+
+def _index_for(path):
+    """The search index for the log at path, brought up to date with new rows."""
+    base = data_store.base_version(path)  # before the table: an edit in between is seen next time
+    df = data_store.read_table(path)
+    target = os.path.abspath(path)
+    index = _indexes.get(target)
+    if index is None or not index.indexes_prefix_of(df, base):
+        index = SearchIndex()
+        index.add(df)
+        _indexes[target] = index
+        _stats["builds"] += 1
+    elif len(index) < len(df):
+        _stats["incremental_rows"] += index.add(df.iloc[len(index):])
+    index.base = base
+    return index
+
+
+def search(query, candidates=None, limit=200, path=data_store.MAINTENANCE_LOG_FILE):
+    """Ranked [(log row position, score)] for query over the log at path."""
+    with profiling.span("search") as s, _lock:
+        hits = _index_for(path).search(query, candidates, limit)
+        s.rows = len(hits)
+    return hits
+
+
+def stats():
+    with _lock:
+        return dict(_stats)
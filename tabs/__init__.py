@@ -0,0 +1 @@
+"""One module per dashboard tab, imported by m.py only when the tab is selected."""
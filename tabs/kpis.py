@@ -0,0 +1,194 @@
+"""KPIs tab: KPI cards and charts per equipment class, machine and month."""
+import streamlit as st
+
+import charts
+import equipment
+import kpi
+
+
+def render():
+    st.title("📊 Equipment Performance KPIs")
+
+    try:
+        # --- تحميل وتجهيز البيانات ---
+        selected_class = st.selectbox("Select Equipment Class", list(equipment.EQUIPMENT_CLASSES), key="kpi_class")
+        cube = equipment.kpi_cube([selected_class])
+        if cube.empty:
+            st.info(f"No {selected_class} hours recorded yet in {equipment.EQUIPMENT_CLASSES[selected_class]['file']}.")
+            return
+        all_months = sorted(cube["Month"].unique())
+
+        # --- فلاتر الماكينة والشهر ---
+        col1, col2 = st.columns([1, 1])
+        with col1:
+            selected_compressor = st.selectbox(f"Select {selected_class}", cube[equipment.KEY].unique(), key="kpi_comp")
+        with col2:
+            selected_month = st.selectbox("Select Month", ["All"] + all_months, key="kpi_month")
+
+        # --- حساب كل مؤشرات الـKPIs ---
+        card = kpi.summarize(cube, selected_compressor, selected_month, key=equipment.KEY)
+        running_hours = card["Running Hours"]
+        downtime_hrs = card["Downtime"]
+        faults = card["Faults"]
+        total_hours = card["Total Hours"]
+        availability = card["Availability"]
+        mttr = card["MTTR"]
+        mtbf = card["MTBF"]
+
+        # --- كروت KPIs ملونة ---
+        st.markdown(
+            """
+            <style>
+                .kpi-card {
+                    background-color: #2e3b2e;
+                    border-radius: 15px;
+                    padding: 20px 10px 12px 10px;
+                    margin-bottom: 8px;
+                    box-shadow: 1px 2px 8px 0 #111;
+                    text-align: center;
+                }
+                .kpi-title {
+                    font-size:18px;
+                    font-weight:bold;
+                    color:#ffd54f;
+                    margin-bottom:7px;
+                }
+                .kpi-value {
+                    font-size:32px;
+                    font-weight:bold;
+                    color:#ffde59;
+                    margin-bottom:2px;
+                }
+                .kpi-icon {
+                    font-size:23px;
+                    margin-bottom:6px;
+                }
+                .kpi-sub {
+                    color:#bdbdbd;
+                    font-size:14px;
+                    font-weight:600;
+                }
+            </style>
+            """,
+            unsafe_allow_html=True,
+        )
+
+        k1, k2, k3, k4, k5, k6, k7 = st.columns(7)
+
+        with k1:
+            st.markdown(
+                f"""
+                <div class="kpi-card">
+                    <div class="kpi-icon">⏱️</div>
+                    <div class="kpi-title">Running Hours</div>
+                    <div class="kpi-value">{round(running_hours, 2)}</div>
+                    <div class="kpi-sub">hrs</div>
+                </div>
+                """,
+                unsafe_allow_html=True,
+            )
+        with k2:
+            st.markdown(
+                f"""
+                <div class="kpi-card">
+                    <div class="kpi-icon">⏸️</div>
+                    <div class="kpi-title">Downtime</div>
+                    <div class="kpi-value" style="color:#e65100">{round(downtime_hrs, 2)}</div>
+                    <div class="kpi-sub">hrs</div>
+                </div>
+                """,
+                unsafe_allow_html=True,
+            )
+        with k3:
+            st.markdown(
+                f"""
+                <div class="kpi-card">
+                    <div class="kpi-icon">✅</div>
+                    <div class="kpi-title">Availability</div>
+                    <div class="kpi-value" style="color:#2e7d32">{availability:.1f}%</div>
+                    <div class="kpi-sub">%</div>
+                </div>
+                """,
+                unsafe_allow_html=True,
+            )
+        with k4:
+            st.markdown(
+                f"""
+                <div class="kpi-card">
+                    <div class="kpi-icon">⚠️</div>
+                    <div class="kpi-title">Faults</div>
+                    <div class="kpi-value" style="color:#b71c1c">{int(faults)}</div>
+                    <div class="kpi-sub">No.</div>
+                </div>
+                """,
+                unsafe_allow_html=True,
+            )
+        with k5:
+            st.markdown(
+                f"""
+                <div class="kpi-card">
+                    <div class="kpi-icon">🛠️</div>
+                    <div class="kpi-title">MTTR</div>
+                    <div class="kpi-value" style="color:#1565c0">{mttr:.2f}</div>
+                    <div class="kpi-sub">hrs/fault</div>
+                </div>
+                """,
+                unsafe_allow_html=True,
+            )
+        with k6:
+            st.markdown(
+                f"""
+                <div class="kpi-card">
+                    <div class="kpi-icon">📈</div>
+                    <div class="kpi-title">MTBF</div>
+                    <div class="kpi-value" style="color:#4a148c">{mtbf:.2f}</div>
+                    <div class="kpi-sub">hrs/fault</div>
+                </div>
+                """,
+                unsafe_allow_html=True,
+            )
+        with k7:
+            st.markdown(
+                f"""
+                <div class="kpi-card">
+                    <div class="kpi-icon">🔢</div>
+                    <div class="kpi-title">Total Hours</div>
+                    <div class="kpi-value" style="color:#673ab7">{round(total_hours, 2)}</div>
+                    <div class="kpi-sub">hrs</div>
+                </div>
+                """,
+                unsafe_allow_html=True,
+            )
+
+        # --- شارت ديناميكي لأي مؤشر KPI ---
+        client_charts = st.toggle("⚡ Interactive charts (send only the monthly series to the browser)", key="kpi_client_charts")
+        chart_group = kpi.trend(cube, selected_compressor, key=equipment.KEY)
+
+        kpi_options = ["Availability", "MTTR", "MTBF"]
+        selected_kpi_chart = st.selectbox("Select KPI to Show Chart", kpi_options, key="kpi_chart_select")
+        if client_charts:
+            st.line_chart(chart_group, x="Month", y=selected_kpi_chart)
+        else:
+            st.image(charts.trend_png(chart_group["Month"], chart_group[selected_kpi_chart],
+                                      selected_kpi_chart, selected_compressor), width="stretch")
+
+        # --- شارت مقارنة كل الضواغط في شهر معين (Bar Chart) ---
+        selected_bar_month = st.selectbox("🔎 Select Month for Running Hours Comparison", all_months, key="bar_month")
+        bar_data = kpi.month_slice(cube, selected_bar_month)
+        if client_charts:
+            st.bar_chart(bar_data, x=equipment.KEY, y="Running Hours", x_label=selected_class)
+        else:
+            st.image(charts.running_hours_png(bar_data[equipment.KEY], bar_data["Running Hours"],
+                                              selected_class, selected_bar_month), width="stretch")
+
+        # --- شارت Total Hours داكنة وألوان عالمية ---
+        selected_total_month = st.selectbox("🌙 اختر شهر لمقارنة Total Hours", all_months, key="total_hours_month")
+        total_hours_data = kpi.month_slice(cube, selected_total_month).dropna(subset=["Total Hours"])
+        if client_charts:
+            st.bar_chart(total_hours_data, x=equipment.KEY, y="Total Hours", x_label=selected_class)
+        else:
+            st.image(charts.total_hours_png(total_hours_data[equipment.KEY], total_hours_data["Total Hours"],
+                                            selected_class, selected_total_month), width="stretch")
+
+    except Exception as e:
+        st.error(f"Error loading KPIs data: {e}")
@@ -0,0 +1,146 @@
+"""Maintenance Log tab: event entry, indexed filter, pagination, PDF export and search."""
+import time
+
+import streamlit as st
+
+import bulk_import
+import data_store
+import equipment
+import log_index
+import report
+import search_index
+
+machine_list = equipment.MACHINE_LIST
+
+
+def render():
+    st.subheader("📝 Maintenance Log")
+
+    if "event_count" not in st.session_state:
+        st.session_state.event_count = 1
+    if "removed_indices" not in st.session_state:
+        st.session_state.removed_indices = set()
+
+    add_event = st.button("➕ Add Event")
+    if add_event:
+        st.session_state.event_count += 1
+
+    st.markdown("### ✍️ Enter Maintenance Events")
+    with st.form("form_add_dynamic_log"):
+        log_date = st.date_input("📅 Date (applies to all events)", key="dynamic_log_date")
+
+        event_data = []
+        for i in range(st.session_state.event_count):
+            st.markdown(f"---\n📝 **Event {i+1}**")
+            cols = st.columns([2.5, 1, 3, 2.5, 1])
+            with cols[0]:
+                machine = st.selectbox(f"🏭 Machine {i+1}", machine_list, key=f"dyn_machine_{i}")
+            with cols[1]:
+                minutes = st.number_input(f"⏱️ Time (min) {i+1}", min_value=0, step=1, key=f"dyn_minutes_{i}")
+            with cols[2]:
+                event = st.text_area(f"🛠️ Event Description {i+1}", height=100, key=f"dyn_event_{i}")
+            with cols[3]:
+                spare = st.text_input(f"🔩 Spare Parts {i+1}", key=f"dyn_spare_{i}")
+            with cols[4]:
+                if st.form_submit_button(f"❌ Remove {i+1}"):
+                    st.session_state.removed_indices.add(i)
+            event_data.append((i, machine, minutes, event, spare))
+
+        submit_dynamic = st.form_submit_button("✅ Save All Events")
+
+        if submit_dynamic:
+            records = []
+            for i, machine, minutes, event, spare in event_data:
+                if i in st.session_state.removed_indices:
+                    continue
+                records.append({
+                    "Date": log_date,
+                    "Machine": machine,
+                    "Time (min)": minutes,
+                    "Event": event,
+                    "Spare Parts": spare
+                })
+            if records:
+                try:
+                    data_store.append_rows(data_store.MAINTENANCE_LOG_FILE, records)
+                    st.success(f"✅ {len(records)} maintenance events saved.")
+                    st.session_state.removed_indices.clear()
+                except Exception as e:
+                    st.exception(e)
+            else:
+                st.warning("⚠️ No events were entered.")
+
+    # --- استيراد مجمّع من ملفات CSV / Excel ---
+    with st.expander("📥 Bulk import (CSV / Excel)"):
+        target = st.selectbox("Import into", list(bulk_import.TARGETS), key="bulk_target",
+                              format_func=lambda t: t.replace("_", " ").capitalize())
+        upload = st.file_uploader("CMMS export", type=["csv", "xlsx"], key="bulk_file")
+        dry_run = st.checkbox("Validate only (dry run)", key="bulk_dry_run")
+        if upload is not None and st.button("📥 Import", key="bulk_import"):
+            progress = st.empty()
+            try:
+                result = bulk_import.import_file(
+                    target, upload, name=upload.name, dry_run=dry_run,
+                    on_batch=lambda s: progress.caption(f"{s['read']} rows read · {s['imported']} new · "
+                                                        f"{s['rows_per_sec']:.0f} rows/s"))
+                st.success(f"✅ {'Validated' if dry_run else 'Imported'} {result['imported']} of {result['read']} rows "
+                           f"in {result['seconds']:.1f} s ({result['rows_per_sec']:.0f} rows/s) · "
+                           f"{result['duplicates']} duplicates · {result['rejected']} rejected")
+                if result["ignored_columns"]:
+                    st.info(f"Ignored columns: {', '.join(result['ignored_columns'])}")
+                if result["rejected_samples"]:
+                    st.dataframe(result["rejected_samples"], use_container_width=True)
+                if result["flagged"]:
+                    st.warning(f"⚠️ {result['flagged']} imported readings are lower than the previous one or "
+                               f"gained more hours than the calendar allows. They distort running hours, "
+                               f"MTBF and availability.")
+                    st.dataframe(result["flagged_samples"], use_container_width=True)
+            except Exception as e:
+                st.error(f"❌ Import failed: {e}")
+
+    st.markdown("### 🔍 Filter by Machine and Date")
+
+    machine_options = ["All Machines"] + machine_list
+    selected_machine = st.selectbox("📌 Filter Machine", machine_options, key="filter_machine")
+
+    index = data_store.derived(data_store.MAINTENANCE_LOG_FILE, "log_index", log_index.LogIndex)
+    first_date, last_date = index.date_bounds()
+
+    col1, col2 = st.columns(2)
+    with col1:
+        start_date = st.date_input("📆 From Date", value=first_date)
+    with col2:
+        end_date = st.date_input("📅 To Date", value=last_date)
+
+    filtered_df = index.query(None if selected_machine == "All Machines" else selected_machine,
+                              start_date, end_date)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        page_size = st.selectbox("📄 Rows per page", [50, 100, 500, 1000], index=1, key="log_page_size")
+    with col2:
+        page = st.number_input("Page", min_value=1, value=1, step=1, key="log_page")
+    page_df, pages = log_index.paginate(filtered_df, page, page_size)
+    st.caption(f"{len(filtered_df)} events · page {min(page, pages)} of {pages}")
+    st.dataframe(page_df, use_container_width=True)
+    st.download_button("Export to PDF", report.pdf_download(filtered_df, "Maintenance Log"),
+                       file_name="maintenance_log.pdf", mime="application/pdf")
+
+    st.markdown("### 🔎 Search Events and Spare Parts")
+    query = st.text_input("Search text (e.g. oil pump, mechanical seal, part number)", key="log_search")
+    if query.strip():
+        start = time.perf_counter()
+        positions = index.positions(None if selected_machine == "All Machines" else selected_machine,
+                                    start_date, end_date)
+        hits = search_index.search(query, candidates=set(index.labels[positions].tolist()))
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if hits:
+            docs, scores = zip(*hits)
+            log_df = data_store.read_table(data_store.MAINTENANCE_LOG_FILE)
+            matches = log_df.iloc[list(docs)].reindex(columns=log_index.DISPLAY_COLUMNS)
+            matches["Date"] = matches["Date"].dt.date
+            matches.insert(0, "Score", [round(score, 2) for score in scores])
+            st.caption(f"{len(hits)} matches in {elapsed_ms:.1f} ms (within the machine/date filter above)")
+            st.dataframe(matches, use_container_width=True)
+        else:
+            st.info(f"No events match \"{query}\" within the selected machine and dates.")
@@ -0,0 +1,65 @@
+"""Spare Parts tab: critical parts stock, transactions entry and ledger."""
+import streamlit as st
+
+import data_store
+import equipment
+import inventory
+
+machine_list = equipment.MACHINE_LIST
+
+
+def render():
+    st.subheader("🔩 Spare Parts Inventory")
+
+    try:
+        stock_df = inventory.current_stock()
+
+        low_stock = stock_df[stock_df["Below Minimum"]]
+        for name, number, stock, minimum in zip(low_stock["Part Name"], low_stock["Part Number"],
+                                                low_stock["Current Stock"], low_stock["Minimum Stock"]):
+            st.warning(f"⚠️ {name} ({number}): {stock:.0f} in stock, minimum {minimum:.0f}")
+
+        st.markdown("### 📦 Current Stock")
+        st.dataframe(stock_df, use_container_width=True)
+
+        # --- فورم إضافة حركة مخزن ---
+        st.markdown("### ➕ Add Transaction")
+        part_labels = {f"{number} - {name}": number
+                       for number, name in zip(stock_df["Part Number"], stock_df["Part Name"])}
+        with st.form("form_add_transaction"):
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                tx_date = st.date_input("📅 Date", key="tx_date")
+                tx_type = st.selectbox("🔁 Transaction Type", inventory.TRANSACTION_TYPES, key="tx_type")
+            with col2:
+                tx_part = st.selectbox("🔩 Part", list(part_labels), key="tx_part")
+                tx_qty = st.number_input("🔢 Quantity", min_value=0.0, step=1.0, key="tx_qty")
+            with col3:
+                tx_machine = st.selectbox("🏭 Machine", ["-"] + machine_list, key="tx_machine")
+                tx_note = st.text_input("📝 Note", key="tx_note")
+            submit_tx = st.form_submit_button("✅ Save Transaction")
+
+            if submit_tx:
+                if tx_part is None or tx_qty <= 0:
+                    st.warning("⚠️ Select a part and enter a quantity.")
+                else:
+                    part_number = part_labels[tx_part]
+                    try:
+                        data_store.append_rows(data_store.SPARE_PARTS_TRANSACTIONS_FILE, [{
+                            "Date": tx_date,
+                            "Transaction Type": tx_type,
+                            "Part Number": part_number,
+                            "Part Name": tx_part.split(" - ", 1)[1],
+                            "Quantity": tx_qty,
+                            "Machine": None if tx_machine == "-" else tx_machine,
+                            "Note": tx_note,
+                        }])
+                        st.success("✅ Transaction saved.")
+                    except Exception as e:
+                        st.error(f"❌ Error saving transaction: {e}")
+
+        st.markdown("### 📜 Transactions Ledger")
+        ledger_df = inventory.ledger_balances()
+        st.dataframe(ledger_df.iloc[::-1].head(500), use_container_width=True)
+    except Exception as e:
+        st.error(f"❌ Failed to load spare parts data: {e}")
@@ -0,0 +1,45 @@
+import glob
+import os
+import shutil
+import sys
+
+import matplotlib
+import pytest
+
+matplotlib.use("Agg")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import charts  # noqa: E402
+import data_store  # noqa: E402
+import inventory  # noqa: E402
+import kpi_store  # noqa: E402
+import locking  # noqa: E402
+import search_index  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches():
+    """Every test starts with cold module caches."""
+    data_store.invalidate()
+    data_store._due_checked = None
+    with kpi_store._lock:
+        kpi_store._states.clear()
+    with inventory._lock:
+        inventory._ledgers.clear()
+    with search_index._lock:
+        search_index._indexes.clear()
+    with locking._watch_lock:
+        locking._watched.clear()
+    charts.clear()
+    yield
+
+
+@pytest.fixture
+def workbooks(tmp_path, monkeypatch):
+    """A copy of the shipped workbooks as the working directory, without sidecars."""
+    for path in glob.glob(os.path.join(ROOT, "*.xlsx")):
+        shutil.copy(path, tmp_path)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
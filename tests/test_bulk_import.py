@@ -0,0 +1,64 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+import anomalies
+import bulk_import
+import data_store
+
+MACHINE = "Howden MK6D (13)"  # last reading 1561 h on 2025-05-01
+
+
+def _csv(rows):
+    return io.StringIO(pd.DataFrame(rows, columns=["Date", "Compressor", "Total Hours"]).to_csv(index=False))
+
+
+def _import(rows, **kwargs):
+    return bulk_import.import_file("compressor_hours", _csv(rows), chunk_rows=2, name="readings.csv", **kwargs)
+
+
+def test_duplicates_within_and_across_imports(workbooks):
+    rows = [("2025-06-01", MACHINE, 2281), ("2025-06-01", MACHINE, 2281),  # repeated in the file
+            ("2025-07-01", MACHINE, 3001), ("2025-07-01", "nobody", 1),  # unknown machine
+            ("2025-08-01", MACHINE.upper(), 3721)]
+    summary = _import(rows)
+    assert (summary["read"], summary["imported"], summary["duplicates"], summary["rejected"]) == (5, 3, 1, 1)
+    assert summary["batches"] == 3 and summary["flagged"] == 0
+    table = data_store.read_table(data_store.COMPRESSOR_HOURS_FILE)
+    assert table["Total Hours"].iloc[-3:].tolist() == [2281, 3001, 3721]
+
+    again = _import(rows)
+    assert (again["imported"], again["duplicates"]) == (0, 4)
+
+
+def test_readings_are_flagged_across_chunks(workbooks):
+    rows = [("2025-04-01", MACHINE, 5000),  # above the later reading of 1561 h in the workbook
+            ("2025-06-01", MACHINE, 2281), ("2025-07-01", MACHINE, 3001),
+            ("2025-08-01", MACHINE, 2000),  # lower than the reading in the chunk before
+            ("2025-08-02", MACHINE, 9000)]  # more hours than a day has
+    summary = _import(rows, dry_run=True)
+    problems = {(r["Date"].strftime("%Y-%m-%d"), r["Problem"]) for r in summary["flagged_samples"]}
+    assert problems == {("2025-08-01", "lower than before"), ("2025-08-02", "more than the calendar allows"),
+                        ("2025-04-01", "above a later reading")}
+    assert summary["flagged"] == 3 and summary["imported"] == 5
+    assert len(data_store.read_table(data_store.COMPRESSOR_HOURS_FILE)) == 73  # dry run
+
+
+def test_scan_from_in_batches_matches_scan():
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("2024-01-01", periods=300, freq="D")
+    df = pd.DataFrame({"Compressor": rng.choice(["A", "B", "C"], len(dates)), "Date": dates,
+                       "Total Hours": rng.uniform(0, 40, len(dates)).cumsum()})
+    df.loc[rng.choice(len(df), 10, replace=False), "Total Hours"] -= 500
+    expected = anomalies.scan(df)
+
+    spec = {"machine_column": "Compressor"}
+    last = bulk_import.last_readings(df.iloc[:0], spec)
+    found = []
+    for start in range(0, len(df), 37):
+        batch = df.iloc[start:start + 37]
+        found.append(anomalies.scan_from(last, batch))
+        last = bulk_import.last_readings(pd.concat([last.reset_index(), batch]), spec)
+    found = pd.concat(found).sort_values(["Compressor", "Date"], kind="stable").reset_index(drop=True)
+    pd.testing.assert_frame_equal(found, expected, check_dtype=False)
@@ -0,0 +1,36 @@
+import gc
+
+import matplotlib
+
+import charts
+from benchmarks import bench_charts
+
+MONTH = "2024-06"
+MACHINE = "Compressor 0"
+
+
+def test_rerun_is_served_from_the_cache():
+    cube = bench_charts.synthetic_cube()
+    bench_charts.charts_rerun(cube, MACHINE, MONTH)
+    before = charts.cache_stats()
+    bench_charts.charts_rerun(cube, MACHINE, MONTH)
+    after = charts.cache_stats()
+    assert after["misses"] == before["misses"]
+    assert after["hits"] == before["hits"] + 3
+
+
+def test_global_style_is_left_alone():
+    style = dict(matplotlib.rcParams)
+    bench_charts.charts_rerun(bench_charts.synthetic_cube(), MACHINE, MONTH)
+    assert dict(matplotlib.rcParams) == style
+
+
+def test_uncached_renders_do_not_grow_memory():
+    cube = bench_charts.synthetic_cube()
+    reruns = 20
+    bench_charts.measure(bench_charts.uncached_rerun, cube, reruns)  # fill allocator pools and font caches
+    misses = charts.cache_stats()["misses"]
+    growth, _ = bench_charts.measure(bench_charts.uncached_rerun, cube, reruns)
+    gc.collect()
+    assert charts.cache_stats()["misses"] - misses == 3 * (reruns + 1)
+    assert growth * 1024 <= bench_charts.FLAT_KB_PER_RERUN
@@ -0,0 +1,76 @@
+import datetime
+import os
+import time
+
+import pytest
+
+import data_store
+import journal
+
+LOG = data_store.MAINTENANCE_LOG_FILE
+
+
+def _event(day):
+    return {"Date": datetime.date(2026, 1, day), "Machine": "Howden MK6D (5)", "Maintenance Type": "Inspection"}
+
+
+def _reread():
+    data_store.invalidate()
+    return data_store.read_table(LOG)
+
+
+def test_compact_folds_the_journal(workbooks):
+    before = len(data_store.read_table(LOG))
+    data_store.append_rows(LOG, [_event(1), _event(2)], compact=False)
+    assert data_store.compact(LOG) == 2
+    assert not os.path.exists(journal.journal_path(LOG))
+    table = _reread()
+    assert len(table) == before + 2
+    assert table["Date"].iloc[-1] == datetime.datetime(2026, 1, 2)
+    assert data_store.compact(LOG) == 0
+
+
+def test_crash_before_truncate_does_not_duplicate(workbooks, monkeypatch):
+    before = len(data_store.read_table(LOG))
+    data_store.append_rows(LOG, [_event(1), _event(2)], compact=False)
+
+    def crash(path, offset):
+        raise RuntimeError("crash after the workbook was written")
+    with monkeypatch.context() as m:
+        m.setattr(journal, "truncate", crash)
+        with pytest.raises(RuntimeError):
+            data_store.compact(LOG)
+
+    assert len(_reread()) == before + 2
+    data_store.append_rows(LOG, [_event(3)], compact=False)
+    assert len(_reread()) == before + 3
+    assert data_store.compact(LOG) == 1
+    assert len(_reread()) == before + 3
+    # The stamp also survives in the xlsx when the sidecar is gone.
+    sidecar = os.path.splitext(LOG)[0] + ".parquet"
+    if os.path.exists(sidecar):
+        os.remove(sidecar)
+    assert len(_reread()) == before + 3
+
+
+def test_append_compacts_large_journals(workbooks, monkeypatch):
+    monkeypatch.setattr(data_store, "COMPACT_THRESHOLD_BYTES", 1)
+    monkeypatch.setattr(data_store, "compact_in_background", data_store.compact)
+    data_store.append_rows(LOG, [_event(1)])
+    assert journal.size(LOG) == 0
+
+
+def test_compact_due_by_age(workbooks, monkeypatch):
+    monkeypatch.setattr(data_store, "compact_in_background", data_store.compact)
+    data_store.append_rows(LOG, [_event(1)], compact=False)
+    data_store.compact_due()  # startup: every journal with rows
+    assert journal.size(LOG) == 0
+
+    data_store.append_rows(LOG, [_event(2)], compact=False)
+    monkeypatch.setattr(data_store, "COMPACT_CHECK_EVERY_S", 0)
+    data_store.compact_due()  # young journal: kept
+    assert journal.size(LOG) > 0
+    real_time = time.time
+    monkeypatch.setattr(time, "time", lambda: real_time() + data_store.COMPACT_MAX_AGE_S + 1)
+    data_store.compact_due()
+    assert journal.size(LOG) == 0
@@ -0,0 +1,105 @@
+import datetime
+import os
+
+import numpy as np
+import pandas as pd
+
+import data_store
+import inventory
+from benchmarks import synthetic
+
+
+def _ledger(n, n_parts=50, seed=0):
+    critical = synthetic.critical_parts(n_parts, seed)
+    return critical, synthetic.transactions(n, critical["Part Number"], seed=seed)
+
+
+def _later_rows(transactions, n=10):
+    extra = _ledger(n, seed=1)[1]
+    extra["Date"] = transactions["Date"].max() + pd.to_timedelta(np.arange(1, n + 1), unit="D")
+    return pd.concat([transactions, extra], ignore_index=True)
+
+
+def test_part_key_normalizes_numbers():
+    assert list(inventory.part_key([101, 102])) == ["101", "102"]
+    assert list(inventory.part_key([101.0, " 102 ", "A-7"])) == ["101", "102", "A-7"]
+
+
+def test_signed_quantity():
+    transactions = pd.DataFrame({"Transaction Type": ["In", " received", "OUT", "other"], "Quantity": [5, 2, 3, 9]})
+    assert list(inventory.signed_quantity(transactions)) == [5, 2, -3, 0]
+
+
+def test_stock_table():
+    critical = pd.DataFrame({"Part Number": [1, 2], "Part Name": ["Filter", "Belt"],
+                             "Quantity": [10, 1], "Minimum Stock": [2, 2]})
+    transactions = pd.DataFrame({"Part Number": ["1", 2.0], "Transaction Type": ["Out", "In"], "Quantity": [9, 4]})
+    stock = inventory.stock_table(critical, inventory.net_movements(transactions)).set_index("Part Number")
+    assert list(stock["Current Stock"]) == [1, 5]
+    assert list(stock["Below Minimum"]) == [True, False]
+
+
+def test_ledger_folds_new_rows():
+    critical, transactions = _ledger(2000)
+    ledger = inventory.Ledger()
+    assert ledger.update(transactions) == len(transactions)
+    opening = inventory._opening(critical)
+    ledger.balances(transactions, opening)
+
+    grown = _later_rows(transactions)
+    assert ledger.update(grown) == 10
+    assert np.allclose(ledger.net.sort_index(), inventory.net_movements(grown).sort_index())
+    balances = ledger.balances(grown, opening)
+    running = inventory.running_balances(critical, grown)
+    assert balances.index.equals(running.index)
+    assert np.allclose(balances["Balance"], running["Balance"])
+
+
+def test_ledger_rebuilds_balances_for_back_dated_rows():
+    critical, transactions = _ledger(500)
+    ledger = inventory.Ledger()
+    ledger.update(transactions)
+    opening = inventory._opening(critical)
+    ledger.balances(transactions, opening)
+
+    extra = _ledger(5, seed=2)[1]
+    extra["Date"] = transactions["Date"].min()
+    grown = pd.concat([transactions, extra], ignore_index=True)
+    ledger.update(grown)
+    running = inventory.running_balances(critical, grown)
+    assert np.allclose(ledger.balances(grown, opening)["Balance"], running["Balance"])
+
+
+def test_edit_to_an_early_row_is_picked_up(workbooks):
+    path = data_store.SPARE_PARTS_TRANSACTIONS_FILE
+    critical = data_store.read_table(data_store.CRITICAL_SPARE_PARTS_FILE)
+    part = inventory.part_key(critical["Part Number"]).iloc[0]
+    rows = [{"Date": datetime.date(2026, 1, day), "Transaction Type": kind, "Part Number": part, "Quantity": qty}
+            for day, kind, qty in [(1, "In", 50), (2, "Out", 3), (3, "In", 5)]]
+    data_store.append_rows(path, rows, compact=False)
+    data_store.compact(path)
+    before = _stock_of(inventory.current_stock(), part)
+
+    # Row 0 corrected from 50 to 7 in Excel: only the first row changes.
+    table = data_store.read_table(path)
+    table.loc[0, "Quantity"] = 7
+    data_store.write_table(path, table)
+    assert _stock_of(inventory.current_stock(), part) == before - 43
+    expected = inventory.running_balances(critical, data_store.read_table(path))
+    assert np.allclose(inventory.ledger_balances()["Balance"], expected["Balance"])
+
+
+def test_compaction_keeps_the_ledger(workbooks):
+    path = data_store.SPARE_PARTS_TRANSACTIONS_FILE
+    rows = [{"Date": datetime.date(2026, 1, 1), "Transaction Type": "In", "Part Number": "1", "Quantity": 4}]
+    data_store.append_rows(path, rows, compact=False)
+    inventory.current_stock()
+    data_store.compact(path)
+    inventory.current_stock()
+    ledger = inventory._ledgers[os.path.abspath(path)]
+    assert ledger.rows_seen == 1 and ledger.base == data_store.base_version(path)
+    assert ledger.update(data_store.read_table(path), ledger.base) == 0
+
+
+def _stock_of(stock, part):
+    return float(stock.loc[stock["Part Number"] == part, "Current Stock"].iloc[0])
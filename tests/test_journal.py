@@ -0,0 +1,66 @@
+import datetime
+import time
+
+import data_store
+import journal
+
+LOG = data_store.MAINTENANCE_LOG_FILE
+
+
+def _event(day, machine="Howden MK6D (5)"):
+    return {"Date": datetime.date(2026, 1, day), "Machine": machine, "Maintenance Type": "Inspection"}
+
+
+def test_append_and_parse(tmp_path):
+    path = str(tmp_path / "wb.xlsx")
+    journal.append(path, [_event(1), _event(2)])
+    rows, end, jid = journal.read(path)
+    assert list(rows["Date"]) == ["2026-01-01", "2026-01-02"]
+    assert end == journal.size(path) and jid
+
+    # The workbook stamp names this journal: the bytes it covers are skipped.
+    journal.append(path, [_event(3)])
+    rows, _, _ = journal.read(path, folded=f"{jid}:{end}")
+    assert list(rows["Date"]) == ["2026-01-03"]
+    # A stamp of another journal skips nothing.
+    assert len(journal.read(path, folded=f"other:{end}")[0]) == 3
+
+
+def test_partial_line_is_not_read(tmp_path):
+    path = str(tmp_path / "wb.xlsx")
+    journal.append(path, [_event(1)])
+    with open(journal.journal_path(path), "ab") as f:
+        f.write(b'{"Date": "2026-01-02", "Mach')  # a writer mid-append
+    rows, end, _ = journal.read(path)
+    assert len(rows) == 1 and end < journal.size(path)
+
+
+def test_truncate_keeps_later_rows_under_a_new_id(tmp_path):
+    path = str(tmp_path / "wb.xlsx")
+    journal.append(path, [_event(1)])
+    _, end, jid = journal.read(path)
+    journal.append(path, [_event(2)])
+    journal.truncate(path, end)
+    rows, _, new_id = journal.read(path, folded=f"{jid}:{end}")
+    assert new_id != jid and list(rows["Date"]) == ["2026-01-02"]
+
+    _, end, _ = journal.read(path)
+    journal.truncate(path, end)
+    assert journal.size(path) == 0 and journal.age(path) is None
+
+
+def test_age(tmp_path, monkeypatch):
+    path = str(tmp_path / "wb.xlsx")
+    assert journal.age(path) is None
+    journal.append(path, [_event(1)])
+    assert 0 <= journal.age(path) < 60
+    monkeypatch.setattr(time, "time", lambda: 1e12)
+    assert journal.age(path) > 60
+
+
+def test_read_table_merges_the_journal(workbooks):
+    before = len(data_store.read_table(LOG))
+    data_store.append_rows(LOG, [_event(1), _event(2)], compact=False)
+    table = data_store.read_table(LOG)
+    assert len(table) == before + 2
+    assert table["Date"].iloc[-1] == datetime.datetime(2026, 1, 2)
@@ -0,0 +1,82 @@
+import datetime
+
+import pandas as pd
+
+import data_store
+import equipment
+import kpi_store
+
+COMPRESSOR = equipment.EQUIPMENT_CLASSES["Compressor"]["machines"][0]
+TOWER = equipment.EQUIPMENT_CLASSES["Cooling Tower"]
+DAYS = [datetime.date(2030, 1, 1) + datetime.timedelta(days=i) for i in range(4)]
+
+
+def _assert_cube_matches_rebuild():
+    incremental = equipment.kpi_cube()
+    kpi_store.reset()
+    pd.testing.assert_frame_equal(incremental.reset_index(drop=True), equipment.kpi_cube().reset_index(drop=True),
+                                  check_exact=False, obj="incremental KPI cube vs full rebuild")
+
+
+def _save_sequence():
+    """Form saves one at a time, the cube read after each: readings, a
+    maintenance row (no Total Hours), more readings, then the first readings
+    of a class whose workbook starts empty (cooling towers, as shipped)."""
+    hours = float(equipment.last_readings("Compressor")["Total Hours"].max()) + 1e6
+    path = data_store.COMPRESSOR_HOURS_FILE
+    steps = [(path, equipment.reading_row("Compressor", DAYS[0], COMPRESSOR, hours)),
+             (path, {"Date": DAYS[1], "Compressor": COMPRESSOR,
+                     "Maintenance Type": "5000h", "Hours at Maintenance": hours}),
+             (path, equipment.reading_row("Compressor", DAYS[2], COMPRESSOR, hours + 24)),
+             (path, equipment.reading_row("Compressor", DAYS[3], COMPRESSOR, hours + 48))]
+    steps += [(TOWER["file"], equipment.reading_row("Cooling Tower", day, TOWER["machines"][0], 100 + 24 * i))
+              for i, day in enumerate(DAYS)]
+    steps.append((TOWER["file"], equipment.reading_row("Cooling Tower", DAYS[0], TOWER["machines"][1], 10)))
+    for path, row in steps:
+        data_store.append_rows(path, [row], compact=False)
+        cube = equipment.kpi_cube()
+    return cube
+
+
+def test_saves_fold_incrementally(workbooks):
+    equipment.kpi_cube()
+    full = kpi_store.stats()["full"]
+    cube = _save_sequence()
+    stats = kpi_store.stats()
+    assert stats["full"] == full and stats["incremental"] >= 1
+    towers = cube[cube[equipment.CLASS_COLUMN] == "Cooling Tower"]
+    assert towers["Running Hours"].sum() == 24 * (len(DAYS) - 1)
+    _assert_cube_matches_rebuild()
+
+
+def test_compaction_does_not_rebuild(workbooks):
+    _save_sequence()
+    full = kpi_store.stats()["full"]
+    data_store.compact(data_store.COMPRESSOR_HOURS_FILE)
+    data_store.compact(TOWER["file"])
+    equipment.kpi_cube()
+    assert kpi_store.stats()["full"] == full
+    _assert_cube_matches_rebuild()
+
+
+def test_hand_edit_rebuilds(workbooks):
+    _save_sequence()
+    data_store.compact(data_store.COMPRESSOR_HOURS_FILE)
+    equipment.kpi_cube()
+    # A correction in the middle of the workbook, as made in Excel.
+    table = data_store.read_table(data_store.COMPRESSOR_HOURS_FILE)
+    readings = table.index[table["Total Hours"].notna()]
+    table.loc[readings[len(readings) // 2], "Total Hours"] += 500
+    data_store.write_table(data_store.COMPRESSOR_HOURS_FILE, table)
+    _assert_cube_matches_rebuild()
+
+
+def test_state_survives_a_restart(workbooks):
+    _save_sequence()
+    cube = equipment.kpi_cube()
+    full = kpi_store.stats()["full"]
+    with kpi_store._lock:
+        kpi_store._states.clear()
+    data_store.invalidate()
+    pd.testing.assert_frame_equal(cube, equipment.kpi_cube())
+    assert kpi_store.stats()["full"] == full
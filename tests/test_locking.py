@@ -0,0 +1,92 @@
+import os
+import threading
+import time
+
+import pytest
+
+import locking
+
+
+@pytest.fixture
+def fast_stale(monkeypatch):
+    monkeypatch.setattr(locking, "STALE_AFTER", 0.2)
+
+
+def _hold(path, hold_s, events):
+    with locking.file_lock(path):
+        lpath = locking.lock_path(path)
+        token = locking._owner(lpath)
+        events["held"].set()
+        time.sleep(hold_s)
+        events["kept"] = locking._owner(lpath) == token
+
+
+def test_writers_take_turns(tmp_path):
+    path = str(tmp_path / "wb.xlsx")
+    counter = tmp_path / "counter"
+    counter.write_text("0")
+
+    def bump():
+        for _ in range(20):
+            with locking.file_lock(path):
+                n = int(counter.read_text())
+                counter.write_text(str(n + 1))
+
+    threads = [threading.Thread(target=bump) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert counter.read_text() == "80"
+    assert sorted(os.listdir(tmp_path)) == ["counter"]
+
+
+def test_dead_lock_is_broken_whatever_its_mtime(tmp_path, fast_stale):
+    path = str(tmp_path / "wb.xlsx")
+    lpath = locking.lock_path(path)
+    with open(lpath, "w") as f:
+        f.write("crashed-host 1 x\n")
+    future = time.time() + 3600  # the file server's clock is an hour ahead
+    os.utime(lpath, (future, future))
+    start = time.monotonic()
+    with locking.file_lock(path, timeout=5):
+        pass
+    assert time.monotonic() - start >= 0.2
+    assert os.listdir(tmp_path) == []
+
+
+def test_live_lock_is_not_broken_whatever_its_mtime(tmp_path, fast_stale, monkeypatch):
+    path = str(tmp_path / "wb.xlsx")
+    real_utime = os.utime
+
+    def skewed_utime(p, times=None):
+        t = time.time() - 3600 + time.monotonic() % 1  # the file server's clock is an hour behind
+        real_utime(p, (t, t))
+    monkeypatch.setattr(os, "utime", skewed_utime)
+
+    events = {"held": threading.Event()}
+    holder = threading.Thread(target=_hold, args=(path, 1.0, events))
+    holder.start()
+    events["held"].wait()
+    with locking.file_lock(path, timeout=5):
+        assert events.get("kept") is True
+    holder.join()
+
+
+def test_release_keeps_a_lock_taken_over_by_someone_else(tmp_path):
+    path = str(tmp_path / "wb.xlsx")
+    lpath = locking.lock_path(path)
+    with locking.file_lock(path):
+        os.remove(lpath)
+        with open(lpath, "w") as f:
+            f.write("other-host 2 y\n")
+    assert locking._owner(lpath) == "other-host 2 y\n"
+
+
+def test_timeout(tmp_path):
+    path = str(tmp_path / "wb.xlsx")
+    with open(locking.lock_path(path), "w") as f:
+        f.write("other-host 2 y\n")
+    with pytest.raises(locking.LockTimeout):
+        with locking.file_lock(path, timeout=0.1):
+            pass
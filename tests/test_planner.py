@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import planner
+from benchmarks import bench_planner
+
+
+@pytest.mark.parametrize("n", [10, 60])
+def test_matches_the_per_compressor_loop(n):
+    df, names = bench_planner.synthetic_hours(n, years=3)
+    legacy_df, legacy_warn = bench_planner.legacy_remaining(df, names)
+    result = planner.remaining_to_next_maintenance(df, machines=names)
+    formatted = planner.format_remaining(result)
+    assert list(formatted["Compressor"]) == list(legacy_df["Compressor"])
+    for mt in planner.DEFAULT_INTERVALS:
+        assert (legacy_df[f"Remaining to {mt}h"] == formatted[f"Remaining to {mt}h"]).all()
+    assert planner.order_warnings(result) == [mt for mt, w in legacy_warn.items() if w]
+
+
+def test_last_maintenance_by_date_not_by_row():
+    df = pd.DataFrame({
+        "Compressor": ["A", "A", "A"],
+        "Date": pd.to_datetime(["2024-03-01", "2024-01-01", "2024-02-01"]),
+        "Total Hours": [np.nan, np.nan, 12000.0],
+        "Maintenance Type": ["5000h", "5000h", None],
+        "Hours at Maintenance": [10000.0, 5000.0, np.nan],
+    })
+    row = planner.remaining_to_next_maintenance(df).iloc[0]
+    assert row["Current Total Hours"] == 12000
+    assert row["Next 5000h At"] == 15000
+    assert row["Remaining to 5000h"] == 3000
+    assert np.isnan(row["Remaining to 10000h"])
+
+
+def test_per_machine_rates():
+    df = pd.DataFrame({"Compressor": ["A", "B"], "Date": pd.to_datetime(["2024-01-01"] * 2),
+                       "Total Hours": [4000.0, 4000.0], "Maintenance Type": ["5000h"] * 2,
+                       "Hours at Maintenance": [0.0, 0.0]})
+    rates = pd.Series({"A": 100.0, "B": 500.0})
+    result = planner.remaining_to_next_maintenance(df, hours_per_month=rates)
+    assert list(result["Months to 5000h"]) == [10.0, 2.0]
+    assert planner.order_warnings(result) == [5000]
@@ -0,0 +1,40 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+
+import data_store
+import equipment
+import schema
+
+
+def test_apply_types_the_columns():
+    df = schema.apply(pd.DataFrame({
+        "Date": ["2024-01-05", "not a date"],
+        "Compressor": ["Howden MK6D (5) ", "Unknown"],
+        "Total Hours": ["18734.3", "x"],
+        "NO. OF FAULTS": [2, None],
+    }))
+    assert df["Date"].isna().tolist() == [False, True]
+    assert list(df["Compressor"].cat.categories[-1:]) == ["Unknown"] and df["Compressor"][0] == "Howden MK6D (5)"
+    assert df["Total Hours"].dtype == "float32" and np.isnan(df["Total Hours"][1])
+    assert df["NO. OF FAULTS"].dtype == "Int16"
+    assert schema.for_export(df)["Total Hours"][0] == 18734.3
+
+
+def test_month_is_a_date_unless_it_holds_numbers():
+    assert pd.api.types.is_datetime64_any_dtype(schema.apply(pd.DataFrame({"Month": ["2024-06-01", None]}))["Month"])
+    assert pd.api.types.is_datetime64_any_dtype(schema.apply(pd.DataFrame({"Month": [np.nan, np.nan]}))["Month"])
+    assert schema.apply(pd.DataFrame({"Month": [1.0, 2.0]}))["Month"].tolist() == [1.0, 2.0]
+    assert schema.validate(pd.DataFrame({"Month": ["2024-06-01", "June"]})) == ["Month: 1 unparseable dates ('June')"]
+
+
+def test_cooling_tower_months_are_written_as_dates(workbooks):
+    spec = equipment.EQUIPMENT_CLASSES["Cooling Tower"]
+    rows = [equipment.reading_row("Cooling Tower", datetime.date(2030, 1, day), spec["machines"][0], 10 * day)
+            for day in (1, 2)]
+    data_store.append_rows(spec["file"], rows, compact=False)
+    data_store.compact(spec["file"])
+    raw = pd.read_excel(spec["file"])
+    assert pd.api.types.is_datetime64_any_dtype(raw["Month"])
+    assert list(raw["Month"]) == [pd.Timestamp(2030, 1, 1), pd.Timestamp(2030, 1, 2)]
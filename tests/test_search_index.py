@@ -0,0 +1,35 @@
+import datetime
+
+import data_store
+import search_index
+
+LOG = data_store.MAINTENANCE_LOG_FILE
+
+
+def _docs(query):
+    return [doc for doc, _ in search_index.search(query)]
+
+
+def _save(event):
+    row = {"Date": datetime.date(2026, 1, 1), "Machine": "Howden MK6D (5)", "Event": event}
+    data_store.append_rows(LOG, [row], compact=False)
+
+
+def test_new_rows_are_added_not_rebuilt(workbooks):
+    assert sorted(_docs("oil")) == [1, 4]
+    builds = search_index.stats()["builds"]
+    _save("Replace gearbox seal")
+    assert _docs("gearbox") == [7]
+    data_store.compact(LOG)  # same rows, new workbook version
+    _save("Check gearbox oil level")
+    assert sorted(_docs("gearbox")) == [7, 8]
+    assert search_index.stats()["builds"] == builds
+
+
+def test_edit_to_an_early_row_rebuilds(workbooks):
+    _docs("oil")
+    table = data_store.read_table(LOG)
+    table.loc[0, "Event"] = "Replace gearbox seal"
+    data_store.write_table(LOG, table)
+    assert _docs("gearbox") == [0]
+    assert _docs("bearing") == []